@@ -19,6 +19,12 @@ from redis.exceptions import RedisError
 from shared.config import load_config
 from shared.cache import init_cache
 from shared.logger import logger, init_logging
+from .database import (
+    background_context,
+    configure_engines,
+    missing_columns,
+    tune_sqlite,
+)
 from .models import db, SyncEvent
 from . import scheduler
 from .scheduler import sched, process_unsent_events
@@ -60,6 +66,7 @@ def create_app(config: Optional[dict] = None) -> Flask:
     )
     if config:
         app.config.update(config)
+    configure_engines(app, cfg)
 
     testing = app.config.get("TESTING") or os.getenv("TESTING")
     if testing:
@@ -73,10 +80,16 @@ def create_app(config: Optional[dict] = None) -> Flask:
     talisman.init_app(app, force_https=not app.config.get("TESTING", False))
     jwt.init_app(app)
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            tune_sqlite(engine, cfg)
     socketio.init_app(app)
+    scheduler.watch_exits(socketio)
 
     scheduler.init_redis()
     app.redis_online = True
+    if not testing and scheduler.get_setting(app, "BOT_RUNNER") == "prefork":
+        scheduler.forkserver.warm()
     app.config.setdefault("SYNC_FALLBACK_FILE", str(Path("sync_fallback.jsonl")))
 
     if not sched.running:
@@ -97,7 +110,7 @@ def create_app(config: Optional[dict] = None) -> Flask:
                     logger.warning("Redis unavailable, deferring sync")
                     socketio.emit("redis_status", {"online": False})
                 app.redis_online = False
-                with app.app_context():
+                with background_context(app):
                     events = SyncEvent.query.filter_by(synced=False).all()
                 fb = Path(app.config["SYNC_FALLBACK_FILE"])
                 with fb.open("a") as fh:
@@ -111,6 +124,14 @@ def create_app(config: Optional[dict] = None) -> Flask:
         sched.add_job(
             enqueue_sync, "interval", minutes=1, id="sync_sender", replace_existing=True
         )
+        # quit drivers left idle by bots that stopped asking for them
+        sched.add_job(
+            scheduler.driver_pool.evict_idle,
+            "interval",
+            minutes=1,
+            id="webdriver_evict",
+            replace_existing=True,
+        )
         sched.start()
 
     @app.before_request
@@ -128,6 +149,14 @@ def create_app(config: Optional[dict] = None) -> Flask:
     app.register_blueprint(api_bp)
     app.register_blueprint(auth_bp)
     with app.app_context():
-        db.create_all()
+        # every model lives on the default bind; the scheduler bind only adds
+        # a second pool to the same database
+        db.create_all(bind_key=None)
+        missing = missing_columns(db.engine, db.metadata)
+    if missing:
+        raise RuntimeError(
+            f"database schema is out of date (missing {', '.join(missing)}); "
+            "run `alembic -c backend/migrations/alembic.ini upgrade head`"
+        )
 
     return app
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+import queue
+from threading import Lock, Thread, local
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from flask import Flask, g
+from flask_sqlalchemy.session import Session
+from sqlalchemy import MetaData, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+from shared.config import Config
+
+SCHEDULER_BIND = "scheduler"
+
+# called with (pool name, seconds spent waiting for a connection)
+observe_checkout: Optional[Callable[[str, float], None]] = None
+# called with (seconds queued, seconds running) for each background write
+observe_write: Optional[Callable[[float, float], None]] = None
+pools: Dict[str, QueuePool] = {}
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` that reports how long checkouts wait for a connection.
+
+    Time spent opening new connections is excluded, so the measurement only
+    reflects contention for the pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._timing = local()
+        pools[self.logging_name or "web"] = self
+
+    def _do_get(self):
+        timing = self._timing
+        # QueuePool._do_get retries by calling itself; time the outer call only
+        if getattr(timing, "active", False):
+            return super()._do_get()
+        timing.active, timing.connecting = True, 0.0
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            timing.active = False
+            waited = time.perf_counter() - started - timing.connecting
+            if observe_checkout is not None:
+                observe_checkout(self.logging_name or "web", max(0.0, waited))
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            if getattr(self._timing, "active", False):
+                self._timing.connecting += time.perf_counter() - started
+
+
+class RoutedSession(Session):
+    """Session that sends background work to the scheduler's own pool."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and g.get("db_bind") == SCHEDULER_BIND:
+            engine = self._db.engines.get(SCHEDULER_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _in_memory(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(cfg: Config, uri: str, background: bool = False) -> dict:
+    """Engine options for the web pool, or the scheduler pool if ``background``."""
+    url = make_url(uri)
+    options: dict = {"pool_pre_ping": cfg.DB_POOL_PRE_PING}
+    if _in_memory(uri):
+        # in-memory databases live in a single connection
+        return options
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_logging_name=SCHEDULER_BIND if background else "web",
+        pool_size=cfg.SCHEDULER_DB_POOL_SIZE if background else cfg.DB_POOL_SIZE,
+        max_overflow=(
+            cfg.SCHEDULER_DB_MAX_OVERFLOW if background else cfg.DB_MAX_OVERFLOW
+        ),
+        pool_timeout=cfg.DB_POOL_TIMEOUT,
+        pool_recycle=cfg.DB_POOL_RECYCLE,
+    )
+    if url.get_backend_name() == "postgresql" and cfg.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={cfg.DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+def configure_engines(app: Flask, cfg: Config) -> None:
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(cfg, uri))
+    if _in_memory(uri):
+        # a second engine would open a separate, empty database; background
+        # work falls back to the default engine instead
+        return
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    binds.setdefault(
+        SCHEDULER_BIND, {"url": uri, **engine_options(cfg, uri, background=True)}
+    )
+
+
+@contextmanager
+def background_context(app: Flask) -> Iterator[None]:
+    """App context whose queries use the scheduler's connection pool.
+
+    The session is scoped to this context and removed when it exits, so
+    connections go back to the pool between ticks.
+    """
+    with app.app_context():
+        g.db_bind = SCHEDULER_BIND
+        yield
+
+
+def missing_columns(engine: Engine, metadata: MetaData) -> List[str]:
+    """Columns of existing tables that ``create_all`` cannot add.
+
+    ``create_all`` only creates missing tables, so a database made by an
+    older release needs ``alembic upgrade head`` before it can be queried.
+    """
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    missing: List[str] = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        missing += [
+            f"{table.name}.{c.name}" for c in table.columns if c.name not in present
+        ]
+    return missing
+
+
+def sqlite_pragmas(cfg: Config) -> List[str]:
+    return [
+        f"PRAGMA journal_mode={cfg.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={cfg.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(cfg.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA mmap_size={int(cfg.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size={int(cfg.SQLITE_CACHE_SIZE)}",
+    ]
+
+
+def tune_sqlite(engine: Engine, cfg: Config) -> None:
+    """Apply ``sqlite_pragmas`` to every new connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(cfg)
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", on_connect)
+
+
+@dataclass
+class WriteStats:
+    completed: int = 0
+    failed: int = 0
+    locked: int = 0
+
+
+class WriteQueue:
+    """Run background database writes one at a time on a dedicated thread.
+
+    SQLite allows a single writer; funnelling scheduler writes through one
+    thread keeps them from contending for the lock with each other and
+    keeps commits off the asyncio loop. Request handlers write directly.
+    """
+
+    def __init__(self):
+        self.stats = WriteStats()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, app: Flask, fn: Callable, *args) -> Future:
+        """Call ``fn(*args)`` in a background app context; return its future."""
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((app, fn, args, future, time.perf_counter()))
+        return future
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Finish queued writes and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            app, fn, args, future, queued = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                with background_context(app):
+                    result = fn(*args)
+            except Exception as exc:  # noqa: broad-except
+                self.stats.failed += 1
+                if isinstance(exc, OperationalError) and "locked" in str(exc):
+                    self.stats.locked += 1
+                future.set_exception(exc)
+            else:
+                self.stats.completed += 1
+                future.set_result(result)
+            if observe_write is not None:
+                observe_write(started - queued, time.perf_counter() - started)
+
+
+writes = WriteQueue()
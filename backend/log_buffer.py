@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent import futures
+from dataclasses import dataclass
+from datetime import datetime
+from threading import RLock, Timer
+from typing import Deque, List, Optional, Tuple
+
+from flask import Flask
+
+from shared.logger import logger
+from .database import WriteQueue
+from .models import Log, db
+
+
+@dataclass
+class BufferStats:
+    rows: int = 0
+    flushes: int = 0
+    throttled: int = 0
+    dropped: int = 0
+
+
+def _insert(rows: List[dict]) -> None:
+    db.session.bulk_insert_mappings(Log, rows)
+    db.session.commit()
+
+
+class LogBuffer:
+    """Batch scheduler ``Log`` rows into bulk inserts.
+
+    Rows are flushed through ``writes`` once ``max_rows`` are buffered or
+    ``max_delay`` seconds after the first one arrives. When more than
+    ``capacity`` rows are buffered or in flight, :meth:`add` hands back a
+    future for the oldest pending flush so producers can wait for it before
+    adding more.
+    """
+
+    def __init__(
+        self,
+        writes: WriteQueue,
+        max_rows: int = 500,
+        max_delay: float = 0.5,
+        capacity: int = 10000,
+    ):
+        self.writes = writes
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max_delay
+        self.capacity = max(capacity, self.max_rows)
+        self.stats = BufferStats()
+        self._rows: List[dict] = []
+        self._app: Optional[Flask] = None
+        self._inflight = 0
+        self._flushes: Deque[futures.Future] = deque()
+        self._timer: Optional[Timer] = None
+        self._lock = RLock()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows) + self._inflight
+
+    def add(self, app: Flask, rows: List[Tuple[int, str]]) -> futures.Future:
+        """Buffer ``(account_id, message)`` rows.
+
+        The returned future is already done unless the buffer is over
+        capacity, in which case it completes when the oldest flush lands.
+        It never raises: a failed insert is logged and counted as dropped.
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            self._app = app
+            self._rows += [
+                {"account_id": aid, "message": message, "timestamp": now}
+                for aid, message in rows
+            ]
+            if len(self._rows) >= self.max_rows:
+                self._flush()
+            elif self._timer is None:
+                self._timer = Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            if len(self._rows) + self._inflight > self.capacity and self._flushes:
+                self.stats.throttled += 1
+                return self._flushes[0]
+        done: futures.Future = futures.Future()
+        done.set_result(None)
+        return done
+
+    def flush(self) -> Optional[futures.Future]:
+        with self._lock:
+            return self._flush()
+
+    def drain(self, timeout: Optional[float] = None) -> None:
+        """Flush buffered rows and wait for every pending insert."""
+        with self._lock:
+            self._flush()
+            pending = list(self._flushes)
+        futures.wait(pending, timeout)
+
+    def _flush(self) -> Optional[futures.Future]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        rows, self._rows = self._rows, []
+        if not rows:
+            return None
+        future = self.writes.submit(self._app, _insert, rows)
+        landed: futures.Future = futures.Future()
+        self._inflight += len(rows)
+        self._flushes.append(landed)
+        future.add_done_callback(lambda done: self._landed(done, landed, len(rows)))
+        return future
+
+    def _landed(
+        self, future: futures.Future, landed: futures.Future, count: int
+    ) -> None:
+        with self._lock:
+            self._inflight -= count
+            self._flushes.remove(landed)
+            if future.exception() is None:
+                self.stats.rows += count
+                self.stats.flushes += 1
+            else:
+                self.stats.dropped += count
+        if future.exception() is not None:
+            logger.error("dropped %d log rows: %s", count, future.exception())
+        landed.set_result(None)
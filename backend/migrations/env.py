@@ -7,7 +7,8 @@ import os
 import backend as app
 
 config = context.config
-fileConfig(config.config_file_name)
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 target_metadata = app.db.metadata
 
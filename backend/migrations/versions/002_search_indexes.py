@@ -0,0 +1,43 @@
+"""indexes for list search"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the server's create_all() may already have built these
+    op.create_index(
+        "ix_groups_name_lower",
+        "groups",
+        [sa.text("lower(name)")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_accounts_username_lower",
+        "accounts",
+        [sa.text("lower(username)")],
+        if_not_exists=True,
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        # lets the default substring ILIKE search use an index
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_groups_name_trgm ON groups USING gin (name gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_accounts_username_trgm "
+            "ON accounts USING gin (username gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_accounts_username_trgm", table_name="accounts")
+        op.drop_index("ix_groups_name_trgm", table_name="groups")
+    op.drop_index("ix_accounts_username_lower", table_name="accounts")
+    op.drop_index("ix_groups_name_lower", table_name="groups")
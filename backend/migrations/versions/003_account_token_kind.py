@@ -0,0 +1,43 @@
+"""store token classification on accounts"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from shared.kick_tokens import mask_token, token_kind
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("accounts")
+    }
+    if "token_kind" not in columns:
+        op.add_column("accounts", sa.Column("token_kind", sa.String(length=16)))
+    if "token_mask" not in columns:
+        op.add_column("accounts", sa.Column("token_mask", sa.String(length=64)))
+    accounts = sa.table(
+        "accounts",
+        sa.column("id", sa.Integer),
+        sa.column("password", sa.Text),
+        sa.column("token_kind", sa.String),
+        sa.column("token_mask", sa.String),
+    )
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(accounts.c.id, accounts.c.password)):
+        conn.execute(
+            accounts.update()
+            .where(accounts.c.id == row.id)
+            .values(
+                token_kind=token_kind(row.password),
+                token_mask=mask_token(row.password),
+            )
+        )
+
+
+def downgrade():
+    op.drop_column("accounts", "token_mask")
+    op.drop_column("accounts", "token_kind")
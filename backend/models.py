@@ -2,9 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from marshmallow import Schema, fields
+from marshmallow import Schema, ValidationError, fields, validates_schema
+from sqlalchemy.orm import validates
 
-db = SQLAlchemy()
+from shared.kick_tokens import (
+    TokenInfo,
+    mask_token,
+    stored_token_info,
+    token_info,
+    token_kind,
+)
+from .database import RoutedSession
+
+db = SQLAlchemy(session_options={"class_": RoutedSession})
 
 
 class Group(db.Model):
@@ -15,6 +25,8 @@ class Group(db.Model):
     interval = db.Column(db.Integer, default=600)
     accounts = db.relationship("Account", backref="group", lazy=True)
 
+    __table_args__ = (db.Index("ix_groups_name_lower", db.func.lower(name)),)
+
 
 class Account(db.Model):
     __tablename__ = "accounts"
@@ -24,6 +36,23 @@ class Account(db.Model):
     proxy = db.Column(db.String(200))
     messages_file = db.Column(db.String(200))
     group_id = db.Column(db.Integer, db.ForeignKey("groups.id"), nullable=False)
+    token_kind = db.Column(db.String(16))
+    token_mask = db.Column(db.String(64))
+
+    __table_args__ = (db.Index("ix_accounts_username_lower", db.func.lower(username)),)
+
+    @validates("password")
+    def _classify_token(self, key: str, value: str) -> str:
+        self.token_kind = token_kind(value)
+        self.token_mask = mask_token(value)
+        return value
+
+    @property
+    def token(self) -> TokenInfo:
+        """Token classification stored when the password was written."""
+        if self.token_kind is None:
+            return token_info(self.password)
+        return stored_token_info(self.token_kind, self.token_mask or "")
 
 
 class Log(db.Model):
@@ -60,3 +89,19 @@ class AccountSchema(Schema):
     proxy = fields.Str(load_default=None)
     messages_file = fields.Str(load_default=None)
     group_id = fields.Int(required=True)
+
+
+class AccountTransferSchema(AccountSchema):
+    """Account rows in exports, which name their group instead of its id.
+
+    Group ids differ between databases, so imports resolve ``group`` by name;
+    ``group_id`` is still accepted for files written by older exports.
+    """
+
+    group_id = fields.Int(load_default=None)
+    group = fields.Str(load_default=None)
+
+    @validates_schema
+    def require_group(self, data, **kwargs):
+        if data.get("group_id") is None and data.get("group") is None:
+            raise ValidationError("group or group_id is required.", "group")
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import os
+import csv
+import io
+from itertools import islice
+import json
 from pathlib import Path
-import subprocess
-import sys
 import time
 
-from flask import Blueprint, request, current_app, Response
-from flask_restx import Api, Resource
+from flask import Blueprint, request, current_app, Response, stream_with_context
+from flask_restx import Api, Resource, abort
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
@@ -16,9 +17,11 @@ from flask_jwt_extended import (
 )
 from marshmallow import ValidationError
 from prometheus_client import generate_latest
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import defer, selectinload
 
-from shared.cache import cache
-from shared.kick_tokens import token_info
+from shared.cache import bump_version, get_or_set, versioned_key
+from shared.kick_tokens import mask_token, token_kind
 from shared.local_kick_mock import (
     ACCOUNT_STATUSES,
     LocalKickMockAdapter,
@@ -26,7 +29,18 @@ from shared.local_kick_mock import (
     read_events,
 )
 from shared.logger import logger
-from .models import db, Group, Account, GroupSchema, AccountSchema, SyncEvent
+from shared.messages import messages
+from shared.rate_limit import LIMIT_KEYS, limiter, load_limits, save_limits
+from bots.supervisor import BotSpec
+from .models import (
+    db,
+    Group,
+    Account,
+    GroupSchema,
+    AccountSchema,
+    AccountTransferSchema,
+    SyncEvent,
+)
 from .utils import role_required
 from . import scheduler
 from .scheduler import sched, schedule_all, log_sync_event
@@ -38,6 +52,18 @@ ns = api.namespace("api", path="/dashboard/api")
 
 auth_bp = Blueprint("auth", __name__)
 
+LISTING_TTL = 60
+MAX_PER_PAGE = 200
+BULK_MAX_ROWS = 5000
+TRANSFER_CHUNK = 500
+TRANSFER_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+IMPORT_MAX_ERRORS = 100
+# listings that embed each entity and must be invalidated when it changes
+LISTING_DEPENDENCIES = {
+    "group": ("groups",),
+    "account": ("accounts", "bots", "groups"),
+}
+
 
 def _bot_log_dir() -> Path:
     path = Path(current_app.config.get("BOT_LOG_DIR", "logs"))
@@ -67,13 +93,24 @@ def _append_bot_log(bot_id: int, message: str) -> None:
         fh.write(line + "\n")
 
 
+def _runner():
+    return scheduler.bot_runner(current_app)
+
+
 def _bot_is_running(bot_id: int) -> bool:
-    proc = scheduler.processes.get(bot_id)
-    return proc is not None and proc.poll() is None
+    return _runner().is_running(bot_id)
+
+
+def _stop_bot(bot_id: int) -> bool:
+    return _runner().stop(bot_id)
+
+
+def _bot_status(bot_id: int) -> dict:
+    return _runner().status(bot_id)
 
 
 def _account_payload(account: Account) -> dict:
-    info = token_info(account.password)
+    info = account.token
     return {
         "id": account.id,
         "username": account.username,
@@ -85,7 +122,7 @@ def _account_payload(account: Account) -> dict:
 
 
 def _start_mode(account: Account) -> tuple[str, str]:
-    info = token_info(account.password)
+    info = account.token
     if info.kind == "cookie":
         return "local_cookie_test", "local"
     if current_app.config.get("BOT_FORCE_LOCAL_TEST") or current_app.config.get(
@@ -95,58 +132,332 @@ def _start_mode(account: Account) -> tuple[str, str]:
     return "live_kick", "auto"
 
 
+def _flag(name: str) -> bool:
+    return (request.args.get(name) or "").lower() in {"1", "true", "yes"}
+
+
+def _search_clause(column, term: str):
+    """Filter ``column`` by ``term``.
+
+    ``match=prefix`` compares ``lower(column)`` as a range so it runs on the
+    expression index; the default substring ILIKE relies on the trigram
+    index on Postgres.
+    """
+    if request.args.get("match") == "prefix":
+        lowered = term.lower()
+        return and_(
+            func.lower(column) >= lowered, func.lower(column) < lowered + "\uffff"
+        )
+    return column.ilike(f"%{term}%")
+
+
+def _count(query, model) -> int:
+    # count ids directly instead of wrapping the full row query
+    return query.order_by(None).with_entities(func.count(model.id)).scalar()
+
+
+def _int_arg(name: str, default: int | None, minimum: int) -> int | None:
+    """Parse query parameter ``name``, aborting with 400 if it is invalid."""
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        abort(400, error=f"{name} must be an integer")
+    if value < minimum:
+        abort(400, error=f"{name} must be at least {minimum}")
+    return value
+
+
+def _list_page(query, model, search_column) -> tuple[list, dict]:
+    """Apply ``search`` and pagination from the request to ``query``.
+
+    ``after_id`` switches to keyset pagination: no OFFSET scan and no
+    COUNT unless ``total=1`` is passed, in which case the count is cached
+    briefly per search.
+    """
+    search = (request.args.get("search") or "").strip()
+    per_page = min(_int_arg("per_page", 50, 1), MAX_PER_PAGE)
+    if search:
+        query = query.filter(_search_clause(search_column, search))
+    query = query.order_by(model.id)
+    after_id = _int_arg("after_id", None, 0)
+    if after_id is None:
+        page = _int_arg("page", 1, 1)
+        pagination = query.paginate(
+            page=page, per_page=per_page, error_out=False, count=False
+        )
+        return pagination.items, {"total": _count(query, model)}
+    rows = query.filter(model.id > after_id).limit(per_page + 1).all()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    meta = {"next_after_id": rows[-1].id if more else None}
+    if _flag("total"):
+        key = versioned_key(
+            model.__tablename__,
+            {"total": search, "match": request.args.get("match")},
+        )
+        meta["total"] = get_or_set(key, lambda: _count(query, model), timeout=30)
+    return rows, meta
+
+
+def _cached_listing(namespace: str, build):
+    """Serve a listing from the cache, keyed on every query parameter."""
+    key = versioned_key(namespace, request.args.to_dict(flat=False))
+    return get_or_set(key, build, timeout=LISTING_TTL)
+
+
+def _invalidate_listings(entity: str) -> None:
+    bump_version(*LISTING_DEPENDENCIES[entity])
+
+
+def _bulk_items() -> list | None:
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("items")
+    return payload if isinstance(payload, list) else None
+
+
+def _load_rows(schema, items) -> tuple[list[tuple[int, dict]], list[dict]]:
+    """Validate ``(index, item)`` pairs, collecting errors by index."""
+    rows, errors = [], []
+    for index, item in items:
+        try:
+            rows.append((index, schema.load(item)))
+        except ValidationError as err:
+            errors.append({"index": index, "errors": err.messages})
+    return rows, errors
+
+
+def _unique_rows(rows, field: str, taken: set, errors: list, message: str) -> list:
+    """Drop rows whose ``field`` is in ``taken`` or repeats an earlier row."""
+    kept = []
+    for index, row in rows:
+        if row[field] in taken:
+            errors.append({"index": index, "error": message})
+            continue
+        taken.add(row[field])
+        kept.append((index, row))
+    return kept
+
+
+def _bulk_insert(model, entity: str, rows: list, key: str, fields: tuple) -> list[dict]:
+    """Insert ``rows`` in one transaction and report them in one sync event.
+
+    Rows are sent as batched multi-row INSERTs; the generated ids are
+    matched back through the unique ``key`` column because batched RETURNING
+    does not keep the row order.
+    """
+    mappings = [row for _, row in rows]
+    if not mappings:
+        return []
+    column = getattr(model, key)
+    ids = dict(
+        db.session.execute(insert(model).returning(column, model.id), mappings).all()
+    )
+    for row in mappings:
+        row["id"] = ids[row[key]]
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.error("database error in bulk %s create", entity, exc_info=True)
+        raise
+    logger.info("bulk created %d %s rows", len(mappings), entity)
+    _invalidate_listings(entity)
+    log_sync_event(
+        entity,
+        "bulk_create",
+        {"items": [{key: row.get(key) for key in fields} for row in mappings]},
+        current_app.extensions["socketio"],
+    )
+    return mappings
+
+
+def _create_groups(rows: list, errors: list) -> list[dict]:
+    names = [row["name"] for _, row in rows]
+    taken = {
+        name for (name,) in db.session.query(Group.name).filter(Group.name.in_(names))
+    }
+    rows = _unique_rows(rows, "name", taken, errors, "Group name already exists.")
+    return _bulk_insert(
+        Group, "group", rows, "name", ("id", "name", "target", "interval")
+    )
+
+
+def _create_accounts(rows: list, errors: list) -> list[dict]:
+    group_ids = {row["group_id"] for _, row in rows}
+    groups = {
+        gid for (gid,) in db.session.query(Group.id).filter(Group.id.in_(group_ids))
+    }
+    valid = []
+    for index, row in rows:
+        if row["group_id"] in groups:
+            valid.append((index, row))
+        else:
+            errors.append({"index": index, "error": "Invalid group_id"})
+    usernames = [row["username"] for _, row in valid]
+    taken = {
+        name
+        for (name,) in db.session.query(Account.username).filter(
+            Account.username.in_(usernames)
+        )
+    }
+    rows = _unique_rows(valid, "username", taken, errors, "account already exists")
+    for _, row in rows:
+        # bulk inserts skip the model validator that classifies tokens
+        row["token_kind"] = token_kind(row["password"])
+        row["token_mask"] = mask_token(row["password"])
+    return _bulk_insert(
+        Account, "account", rows, "username", ("id", "username", "group_id")
+    )
+
+
+def _import_accounts(rows: list, errors: list) -> list[dict]:
+    """``_create_accounts`` for transfer rows, resolving group names to ids."""
+    names = {row["group"] for _, row in rows if row["group"] is not None}
+    group_ids = dict(
+        db.session.query(Group.name, Group.id).filter(Group.name.in_(names))
+    )
+    resolved = []
+    for index, row in rows:
+        name = row.pop("group")
+        if name is not None:
+            if name not in group_ids:
+                errors.append({"index": index, "error": "Unknown group"})
+                continue
+            row["group_id"] = group_ids[name]
+        resolved.append((index, row))
+    return _create_accounts(resolved, errors)
+
+
+def _bulk_create(schema, create, items: list | None, kind: str):
+    if items is None:
+        return {"error": f"expected a list of {kind}"}, 400
+    if len(items) > BULK_MAX_ROWS:
+        return {"error": f"at most {BULK_MAX_ROWS} rows per request"}, 413
+    rows, errors = _load_rows(schema, enumerate(items))
+    try:
+        created = create(rows, errors)
+    except Exception:
+        return {"error": "database error"}, 400
+    errors.sort(key=lambda error: error["index"])
+    result = {"ids": [row["id"] for row in created], "errors": errors}
+    return result, 201 if created or not errors else 400
+
+
+def _export(query, fields: tuple, name: str) -> Response:
+    """Stream the rows of ``query`` as NDJSON or CSV with ``fields`` as keys."""
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in TRANSFER_FORMATS:
+        return {"error": f"format must be one of {', '.join(TRANSFER_FORMATS)}"}, 400
+    query = query.yield_per(TRANSFER_CHUNK)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(fields)
+        for count, row in enumerate(query, 1):
+            if fmt == "csv":
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(dict(zip(fields, row))) + "\n")
+            if count % TRANSFER_CHUNK == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=TRANSFER_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={name}.{fmt}"},
+    )
+
+
+def _import_records(fmt: str):
+    """Yield ``(line, record)`` pairs parsed incrementally from the body."""
+    text = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            # empty cells mean "use the default", as if the key were absent
+            yield reader.line_num, {k: v for k, v in record.items() if v != ""}
+        return
+    for line, raw in enumerate(text, 1):
+        if not raw.strip():
+            continue
+        try:
+            yield line, json.loads(raw)
+        except ValueError:
+            yield line, None
+
+
+def _import(schema, create) -> dict:
+    """Create rows from a streamed body, committing every ``TRANSFER_CHUNK``."""
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in TRANSFER_FORMATS:
+        return {"error": f"format must be one of {', '.join(TRANSFER_FORMATS)}"}, 400
+    created, errors, error_count = 0, [], 0
+    records = _import_records(fmt)
+    while True:
+        chunk = list(islice(records, TRANSFER_CHUNK))
+        if not chunk:
+            break
+        rows, chunk_errors = _load_rows(schema, chunk)
+        try:
+            created += len(create(rows, chunk_errors))
+        except Exception:
+            chunk_errors += [
+                {"index": line, "error": "database error"} for line, _ in rows
+            ]
+        error_count += len(chunk_errors)
+        for error in sorted(chunk_errors, key=lambda error: error["index"]):
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({"line": error.pop("index"), **error})
+    return {"created": created, "errors": errors, "error_count": error_count}
+
+
 def _first_message(account: Account) -> str:
-    msg = "Hello from KickBot"
-    msg_path = Path(account.messages_file or "")
-    if msg_path.is_file():
-        lines = msg_path.read_text(errors="ignore").splitlines()
-        if lines:
-            msg = lines[0]
-    return msg
+    return messages.first(account.messages_file)
 
 
 def _launch_bot(account: Account, group: Group) -> dict:
-    existing = scheduler.processes.get(account.id)
     mode, test_mode = _start_mode(account)
-    info = token_info(account.password)
-    if existing and existing.poll() is None:
+    info = account.token
+    if _bot_is_running(account.id):
         return {
-            "pid": existing.pid,
+            **_bot_status(account.id),
             "mode": mode,
             "token_kind": info.kind,
             "already_running": True,
         }
 
-    cmd = [
-        sys.executable,
-        str(Path(__file__).resolve().parent.parent / "scripts" / "run_bot.py"),
-        "--channel",
-        group.target,
-        "--message",
-        _first_message(account),
-        "--interval",
-        str(group.interval),
-        "--bot-id",
-        str(account.id),
-        "--log-dir",
-        str(_bot_log_dir()),
-        "--test-mode",
-        test_mode,
-    ]
-    env = {**os.environ, "KICK_BOT_TOKEN": account.password}
-    env["KICK_BOT_ID"] = str(account.id)
-    env["LOCAL_KICK_MOCK_FILE"] = str(_local_mock_path())
+    spec = BotSpec(
+        bot_id=account.id,
+        channel=group.target,
+        message=_first_message(account),
+        interval=group.interval,
+        token=account.password,
+        test_mode=test_mode,
+        log_dir=str(_bot_log_dir()),
+        store_path=str(_local_mock_path()),
+    )
     _append_bot_log(
         account.id,
         f"stage=launch mode={mode} token_kind={info.kind}",
     )
-    proc = subprocess.Popen(cmd, env=env)
-    scheduler.processes[account.id] = proc
-    scheduler.running_gauge.inc()
+    runner = _runner()
+    label = scheduler.get_setting(current_app, "BOT_RUNNER")
+    with scheduler.start_latency.labels(label).time():
+        runner.start(spec)
+    pid = runner.status(account.id)["pid"]
     current_app.extensions["socketio"].emit(
         "bot_started", {"id": account.id, "mode": mode}
     )
-    return {"pid": proc.pid, "mode": mode, "token_kind": info.kind}
+    return {"pid": pid, "mode": mode, "token_kind": info.kind}
 
 
 @auth_bp.route("/auth/token", methods=["POST"])
@@ -197,31 +508,41 @@ def refresh_token():
 class GroupResource(Resource):
     @jwt_required(optional=True)
     def get(self):
-        search = (request.args.get("search") or "").strip()
-        page = int(request.args.get("page") or 1)
-        per_page = int(request.args.get("per_page") or 50)
-        if not search and page == 1 and per_page == 50:
-            cached = cache.get("groups")
-            if cached is not None:
-                return cached
+        return _cached_listing("groups", self._listing)
+
+    @staticmethod
+    def _listing() -> dict:
+        counts = _flag("counts")
         query = Group.query
-        if search:
-            query = query.filter(Group.name.ilike(f"%{search}%"))
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        if not counts:
+            query = query.options(
+                selectinload(Group.accounts).load_only(Account.id, Account.username)
+            )
+        rows, meta = _list_page(query, Group, Group.name)
         groups = [
             {
                 "id": g.id,
                 "name": g.name,
                 "target": g.target,
                 "interval": g.interval,
-                "bots": [{"id": a.id, "username": a.username} for a in g.accounts],
             }
-            for g in pagination.items
+            for g in rows
         ]
-        result = {"items": groups, "total": pagination.total}
-        if not search and page == 1 and per_page == 50:
-            cache.set("groups", result, timeout=60)
-        return result
+        if counts:
+            totals = dict(
+                db.session.query(Account.group_id, func.count(Account.id))
+                .filter(Account.group_id.in_([g["id"] for g in groups]))
+                .group_by(Account.group_id)
+                .all()
+            )
+            for group in groups:
+                group["bot_count"] = totals.get(group["id"], 0)
+        else:
+            for group, g in zip(groups, rows):
+                group["bots"] = [
+                    {"id": a.id, "username": a.username} for a in g.accounts
+                ]
+        return {"items": groups, **meta}
 
     @role_required("operator", "admin")
     def post(self):
@@ -242,6 +563,7 @@ class GroupResource(Resource):
             logger.error("database error creating group", exc_info=True)
             return {"error": "database error"}, 400
         logger.info("created group %s", group.name)
+        _invalidate_listings("group")
         log_sync_event(
             "group",
             "create",
@@ -260,15 +582,13 @@ class GroupResource(Resource):
 class AccountResource(Resource):
     @jwt_required(optional=True)
     def get(self):
-        search = (request.args.get("search") or "").strip()
-        page = int(request.args.get("page") or 1)
-        per_page = int(request.args.get("per_page") or 50)
-        query = Account.query
-        if search:
-            query = query.filter(Account.username.ilike(f"%{search}%"))
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        accounts = [_account_payload(a) for a in pagination.items]
-        return {"items": accounts, "total": pagination.total}
+        return _cached_listing("accounts", self._listing)
+
+    @staticmethod
+    def _listing() -> dict:
+        query = Account.query.options(defer(Account.password))
+        rows, meta = _list_page(query, Account, Account.username)
+        return {"items": [_account_payload(a) for a in rows], **meta}
 
     @role_required("operator", "admin")
     def post(self):
@@ -296,6 +616,7 @@ class AccountResource(Resource):
             logger.error("database error creating account", exc_info=True)
             return {"error": "database error"}, 400
         logger.info("created account %s in group %s", account.username, group_id)
+        _invalidate_listings("account")
         log_sync_event(
             "account",
             "create",
@@ -313,27 +634,32 @@ class AccountResource(Resource):
 class BotListResource(Resource):
     @jwt_required(optional=True)
     def get(self):
-        search = (request.args.get("search") or "").strip()
-        page = int(request.args.get("page") or 1)
-        per_page = int(request.args.get("per_page") or 50)
-        query = Account.query
-        if search:
-            query = query.filter(Account.username.ilike(f"%{search}%"))
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        # run state changes without a write, so it is applied after the cache
+        listing = _cached_listing("bots", self._listing)
+        running = set(_runner().running_ids())
+        bots = [
+            {**bot, "status": "online" if bot["id"] in running else "offline"}
+            for bot in listing["items"]
+        ]
+        return {**listing, "items": bots}
+
+    @staticmethod
+    def _listing() -> dict:
+        query = Account.query.options(defer(Account.password))
+        rows, meta = _list_page(query, Account, Account.username)
         bots = []
-        for acc in pagination.items:
-            info = token_info(acc.password)
+        for acc in rows:
+            info = acc.token
             bots.append(
                 {
                     "id": acc.id,
                     "username": acc.username,
                     "group_id": acc.group_id,
-                    "status": "online" if _bot_is_running(acc.id) else "offline",
                     "token_kind": info.kind,
                     "mode": info.mode,
                 }
             )
-        return {"items": bots, "total": pagination.total}
+        return {"items": bots, **meta}
 
     @role_required("operator", "admin")
     def post(self):
@@ -353,6 +679,7 @@ class BotListResource(Resource):
         except Exception:
             db.session.rollback()
             return {"error": "database error"}, 400
+        _invalidate_listings("account")
         log_sync_event(
             "account",
             "create",
@@ -366,6 +693,71 @@ class BotListResource(Resource):
         return {"id": account.id, "group_id": account.group_id}, 201
 
 
+@ns.route("/groups/bulk", methods=["POST"], endpoint="groups_bulk")
+class GroupBulk(Resource):
+    @role_required("operator", "admin")
+    def post(self):
+        return _bulk_create(GroupSchema(), _create_groups, _bulk_items(), "groups")
+
+
+@ns.route("/accounts/bulk", methods=["POST"], endpoint="accounts_bulk")
+class AccountBulk(Resource):
+    @role_required("operator", "admin")
+    def post(self):
+        return _bulk_create(
+            AccountSchema(), _create_accounts, _bulk_items(), "accounts"
+        )
+
+
+@ns.route("/groups/export", methods=["GET"], endpoint="groups_export")
+class GroupExport(Resource):
+    @role_required("operator", "admin")
+    def get(self):
+        query = Group.query.with_entities(
+            Group.name, Group.target, Group.interval
+        ).order_by(Group.id)
+        return _export(query, ("name", "target", "interval"), "groups")
+
+
+@ns.route("/accounts/export", methods=["GET"], endpoint="accounts_export")
+class AccountExport(Resource):
+    # exports carry account tokens
+    @role_required("admin")
+    def get(self):
+        # groups are named rather than numbered, since ids differ between
+        # databases and an imported group gets a new one
+        query = (
+            Account.query.outerjoin(Group, Account.group_id == Group.id)
+            .with_entities(
+                Account.username,
+                Account.password,
+                Account.proxy,
+                Account.messages_file,
+                Group.name,
+            )
+            .order_by(Account.id)
+        )
+        return _export(
+            query,
+            ("username", "password", "proxy", "messages_file", "group"),
+            "accounts",
+        )
+
+
+@ns.route("/groups/import", methods=["POST"], endpoint="groups_import")
+class GroupImport(Resource):
+    @role_required("operator", "admin")
+    def post(self):
+        return _import(GroupSchema(), _create_groups)
+
+
+@ns.route("/accounts/import", methods=["POST"], endpoint="accounts_import")
+class AccountImport(Resource):
+    @role_required("operator", "admin")
+    def post(self):
+        return _import(AccountTransferSchema(), _import_accounts)
+
+
 @ns.route("/scheduler/start", methods=["POST"], endpoint="scheduler_start")
 class SchedulerStart(Resource):
     @role_required("operator", "admin")
@@ -376,6 +768,33 @@ class SchedulerStart(Resource):
         return {"status": "started"}
 
 
+@ns.route("/rate-limits", methods=["GET", "PATCH"], endpoint="rate_limits")
+class RateLimits(Resource):
+    @jwt_required(optional=True)
+    def get(self):
+        return load_limits(scheduler.get_setting(current_app, "RATE_LIMIT_FILE"))
+
+    @role_required("operator", "admin")
+    def patch(self):
+        payload = request.get_json(silent=True) or {}
+        path = scheduler.get_setting(current_app, "RATE_LIMIT_FILE")
+        limits = load_limits(path)
+        for key in LIMIT_KEYS:
+            if key not in payload:
+                continue
+            cast = float if key.endswith("_rate") else int
+            try:
+                value = cast(payload[key])
+            except (TypeError, ValueError):
+                return {"error": f"{key} must be a number"}, 400
+            if value <= 0:
+                return {"error": f"{key} must be positive"}, 400
+            limits[key] = value
+        save_limits(limits, path)
+        limiter.configure(limits)
+        return limits
+
+
 @ns.route("/status", methods=["GET"], endpoint="status")
 class AppStatus(Resource):
     @jwt_required(optional=True)
@@ -405,12 +824,8 @@ class BotStart(Resource):
 class BotStop(Resource):
     @role_required("operator", "admin")
     def post(self, bot_id: int):
-        proc = scheduler.processes.get(bot_id)
-        if proc and proc.poll() is None:
-            proc.terminate()
-            scheduler.running_gauge.dec()
+        if _stop_bot(bot_id):
             _append_bot_log(bot_id, "stage=stop_requested source=dashboard")
-            current_app.extensions["socketio"].emit("bot_stopped", {"id": bot_id})
             return {"stopped": True, "running": False}
         return {"stopped": False}
 
@@ -419,14 +834,10 @@ class BotStop(Resource):
 class BotStatus(Resource):
     @jwt_required(optional=True)
     def get(self, bot_id: int):
-        proc = scheduler.processes.get(bot_id)
-        running = proc is not None and proc.poll() is None
         account = Account.query.get(bot_id)
-        info = token_info(account.password) if account else None
+        info = account.token if account else None
         return {
-            "running": running,
-            "pid": proc.pid if proc else None,
-            "returncode": proc.poll() if proc else None,
+            **_bot_status(bot_id),
             "mode": info.mode if info else "missing",
             "token_kind": info.kind if info else "missing",
         }
@@ -459,7 +870,7 @@ class BotCommand(Resource):
         payload = request.get_json(silent=True) or {}
         command = (payload.get("cmd") or "").strip()
         args = payload.get("args") or {}
-        info = token_info(account.password)
+        info = account.token
 
         if command == "status_check":
             _append_bot_log(
@@ -512,10 +923,7 @@ class BotCommand(Resource):
                 "logged": True,
             }
         if command == "restart":
-            proc = scheduler.processes.get(bot_id)
-            if proc and proc.poll() is None:
-                proc.terminate()
-                scheduler.running_gauge.dec()
+            if _stop_bot(bot_id):
                 _append_bot_log(bot_id, "stage=restart stop_previous=true")
             result = _launch_bot(account, group)
             return {"status": "ok", **result}
@@ -717,6 +1125,19 @@ class LocalChannel(Resource):
         return _local_adapter().get_channel(channel)
 
 
+def _invalid_item(items: list, required: tuple) -> dict | None:
+    """Error payload for the first item that is not an object with ``required``."""
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not all(
+            str(item.get(key) or "").strip() for key in required
+        ):
+            return {
+                "error": f"items[{index}] must be an object with {', '.join(required)}",
+                "index": index,
+            }
+    return None
+
+
 @ns.route(
     "/local/actions/sendMessage",
     methods=["POST"],
@@ -726,6 +1147,23 @@ class LocalActionSendMessage(Resource):
     @role_required("operator", "admin")
     def post(self):
         payload = request.get_json(silent=True) or {}
+        if isinstance(payload.get("items"), list):
+            error = _invalid_item(payload["items"], ("account_id", "channel"))
+            if error is not None:
+                return error, 400
+            items = [
+                (
+                    str(item["account_id"]),
+                    str(item["channel"]),
+                    str(item.get("message") or item.get("content") or ""),
+                )
+                for item in payload["items"]
+            ]
+            results = _local_adapter().send_many(items)
+            return {
+                "items": [_platform_result_payload(r) for r in results],
+                "total": len(results),
+            }
         account_id = str(payload.get("account_id") or "").strip()
         channel = str(payload.get("channel") or "").strip()
         message = str(payload.get("message") or payload.get("content") or "")
@@ -742,6 +1180,19 @@ class LocalActionFollow(Resource):
     @role_required("operator", "admin")
     def post(self):
         payload = request.get_json(silent=True) or {}
+        if isinstance(payload.get("items"), list):
+            error = _invalid_item(payload["items"], ("account_id", "channel"))
+            if error is not None:
+                return error, 400
+            items = [
+                (str(item["account_id"]), str(item["channel"]))
+                for item in payload["items"]
+            ]
+            results = _local_adapter().follow_many(items)
+            return {
+                "items": [_platform_result_payload(r) for r in results],
+                "total": len(results),
+            }
         account_id = str(payload.get("account_id") or "").strip()
         channel = str(payload.get("channel") or "").strip()
         if not account_id or not channel:
@@ -886,6 +1337,7 @@ def sync_push():
     payload = request.get_json(silent=True) or []
     if not isinstance(payload, list):
         return {"error": "invalid payload"}, 400
+    changed = set()
     for item in payload:
         if (
             not item.get("event_id")
@@ -900,29 +1352,40 @@ def sync_push():
             synced=True,
         )
         db.session.add(se)
-        if se.entity == "group" and se.action == "create":
-            if not Group.query.filter_by(name=se.payload.get("name")).first():
-                db.session.add(
-                    Group(
-                        name=se.payload.get("name"),
-                        target=se.payload.get("target"),
-                        interval=se.payload.get("interval", 600),
+        if se.action == "create":
+            items = [se.payload]
+        elif se.action == "bulk_create":
+            items = se.payload.get("items", [])
+        else:
+            continue
+        for data in items:
+            if se.entity == "group":
+                if not Group.query.filter_by(name=data.get("name")).first():
+                    db.session.add(
+                        Group(
+                            name=data.get("name"),
+                            target=data.get("target"),
+                            interval=data.get("interval", 600),
+                        )
                     )
-                )
-        elif se.entity == "account" and se.action == "create":
-            if not Account.query.filter_by(
-                username=se.payload.get("username")
-            ).first() and Group.query.get(se.payload.get("group_id")):
-                db.session.add(
-                    Account(
-                        username=se.payload.get("username"),
-                        password=se.payload.get("password", ""),
-                        proxy=se.payload.get("proxy"),
-                        messages_file=se.payload.get("messages_file"),
-                        group_id=se.payload.get("group_id"),
+                    changed.add("group")
+            elif se.entity == "account":
+                if not Account.query.filter_by(
+                    username=data.get("username")
+                ).first() and Group.query.get(data.get("group_id")):
+                    db.session.add(
+                        Account(
+                            username=data.get("username"),
+                            password=data.get("password", ""),
+                            proxy=data.get("proxy"),
+                            messages_file=data.get("messages_file"),
+                            group_id=data.get("group_id"),
+                        )
                     )
-                )
+                    changed.add("account")
     db.session.commit()
+    for entity in changed:
+        _invalidate_listings(entity)
     return {"status": "ok"}
 
 
@@ -1,28 +1,41 @@
 from __future__ import annotations
 
 import asyncio
-import os
+import atexit
+from concurrent import futures
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from threading import Thread, Timer as _Timer  # Timer re-exported for tests
-import subprocess
-import sys
+import random
+from threading import Lock, Thread, Timer as _Timer  # Timer re-exported for tests
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import uuid4
 
 import redis
 from rq import Queue
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from flask import current_app, Flask
+from shared.cache import stats as cache_stats
 from shared.config import load_config
-from shared.kick_tokens import token_info
 from shared.local_kick_mock import LocalKickMockAdapter
 from shared.logger import logger, notify_webhook
+from shared.messages import messages
+from bots.channels import channels
 from bots.instance import BotInstance
-from .models import db, Group, Account, Log, SyncEvent
+from bots.processes import ProcessSupervisor
+from bots.supervisor import BotSpec, BotSupervisor
+from bots.webdriver_pool import pool as driver_pool
+from bots.workers import ZYGOTE_SCRIPT, WorkerPool
+from . import database
+from .database import background_context
+from .log_buffer import LogBuffer
+from .models import db, Group, Account, SyncEvent
+from .timing_wheel import TimingWheel
 from flask_socketio import SocketIO
-from prometheus_client import Counter, Gauge, CollectorRegistry
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry
 
 Timer = _Timer
 
@@ -51,9 +64,337 @@ errors_counter = Counter("bot_errors", "Number of bot errors", registry=registry
 running_gauge = Gauge(
     "bots_running", "Currently running bot processes", registry=registry
 )
+busy_threads = Gauge(
+    "scheduler_busy_threads",
+    "APScheduler worker threads running a job",
+    registry=registry,
+)
+pool_threads = Gauge(
+    "scheduler_threads", "APScheduler worker thread pool size", registry=registry
+)
+pool_threads.set(WORKERS)
+sched.add_listener(lambda _event: busy_threads.inc(), EVENT_JOB_SUBMITTED)
+sched.add_listener(
+    lambda _event: busy_threads.dec(), EVENT_JOB_EXECUTED | EVENT_JOB_ERROR
+)
+
+chat_sockets = Gauge(
+    "chat_sockets_open", "Open chat websockets shared per channel", registry=registry
+)
+chat_sockets.set_function(channels.open_count)
+
+driver_create_seconds = Histogram(
+    "webdriver_create_seconds",
+    "Time to start a Chrome webdriver",
+    buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+    registry=registry,
+)
+driver_pool.observe_create = driver_create_seconds.observe
+driver_pool_events = Gauge(
+    "webdriver_pool_events",
+    "Webdriver pool hits, misses and discards",
+    ["event"],
+    registry=registry,
+)
+for _event in ("hits", "misses", "evicted", "recycled", "dead"):
+    driver_pool_events.labels(_event).set_function(
+        partial(getattr, driver_pool.stats, _event)
+    )
+driver_pool_size = Gauge(
+    "webdriver_pool_drivers", "Pooled webdrivers", ["state"], registry=registry
+)
+driver_pool_size.labels("idle").set_function(driver_pool.idle_count)
+driver_pool_size.labels("leased").set_function(driver_pool.leased_count)
+
+cache_requests = Gauge(
+    "cache_requests",
+    "Cache lookups by tier and result",
+    ["tier", "result"],
+    registry=registry,
+)
+for _tier in ("local", "remote"):
+    cache_requests.labels(_tier, "hit").set_function(
+        partial(getattr, cache_stats, f"{_tier}_hits")
+    )
+    cache_requests.labels(_tier, "miss").set_function(
+        partial(getattr, cache_stats, f"{_tier}_misses")
+    )
+cache_invalidations = Gauge(
+    "cache_invalidations",
+    "Local cache entries dropped on another process's write",
+    registry=registry,
+)
+cache_invalidations.set_function(lambda: cache_stats.invalidations)
+
+db_pool_wait = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a database connection",
+    ["pool"],
+    registry=registry,
+)
+database.observe_checkout = lambda pool, seconds: db_pool_wait.labels(pool).observe(
+    seconds
+)
+db_pool_connections = Gauge(
+    "db_pool_connections",
+    "Database connections by pool and state",
+    ["pool", "state"],
+    registry=registry,
+)
+
+
+def _pool_stat(name: str, stat: str) -> int:
+    pool = database.pools.get(name)
+    # QueuePool.overflow() counts up from -pool_size
+    return max(0, getattr(pool, stat)()) if pool is not None else 0
+
+
+db_write_seconds = Histogram(
+    "db_write_seconds",
+    "Background database writes: time queued and time running",
+    ["stage"],
+    registry=registry,
+)
+
+
+def _observe_write(waited: float, ran: float) -> None:
+    db_write_seconds.labels("queued").observe(waited)
+    db_write_seconds.labels("running").observe(ran)
+
+
+database.observe_write = _observe_write
+db_write_queue = Gauge(
+    "db_write_queue_depth", "Background writes waiting to run", registry=registry
+)
+db_write_queue.set_function(database.writes.pending)
+db_writes = Gauge(
+    "db_writes", "Background writes by result", ["result"], registry=registry
+)
+for _result in ("completed", "failed", "locked"):
+    db_writes.labels(_result).set_function(
+        partial(getattr, database.writes.stats, _result)
+    )
+
+log_buffer = LogBuffer(
+    database.writes,
+    max_rows=cfg.LOG_BATCH_ROWS,
+    max_delay=cfg.LOG_FLUSH_MS / 1000,
+    capacity=cfg.LOG_BUFFER_CAPACITY,
+)
+# the writer thread is a daemon, so drain it before the interpreter exits
+atexit.register(log_buffer.drain, 10)
+log_buffer_rows = Gauge(
+    "log_buffer_rows", "Log rows buffered or being inserted", registry=registry
+)
+log_buffer_rows.set_function(log_buffer.pending)
+log_buffer_events = Gauge(
+    "log_buffer_events",
+    "Log rows inserted or dropped, flushes and throttled producers",
+    ["event"],
+    registry=registry,
+)
+for _event in ("rows", "flushes", "throttled", "dropped"):
+    log_buffer_events.labels(_event).set_function(
+        partial(getattr, log_buffer.stats, _event)
+    )
+
+for _pool in ("web", database.SCHEDULER_BIND):
+    for _stat in ("checkedout", "overflow", "checkedin"):
+        db_pool_connections.labels(_pool, _stat).set_function(
+            partial(_pool_stat, _pool, _stat)
+        )
+
+wheel = TimingWheel(tick=cfg.WHEEL_TICK_SECONDS)
+wheel_timers = Gauge(
+    "tick_wheel_timers", "Bot ticks registered on the timing wheel", registry=registry
+)
+wheel_timers.set_function(lambda: len(wheel))
+wheel_lag = Gauge(
+    "tick_wheel_lag_seconds",
+    "Lateness of the last timing wheel tick",
+    registry=registry,
+)
+wheel_lag.set_function(lambda: wheel.lag)
+wheel_missed = Gauge(
+    "tick_wheel_missed",
+    "Bot ticks coalesced after the loop fell behind",
+    registry=registry,
+)
+wheel_missed.set_function(lambda: wheel.missed)
 
 bots: Dict[int, BotInstance] = {}
-processes: Dict[int, subprocess.Popen] = {}
+login_executor = futures.ThreadPoolExecutor(
+    max_workers=cfg.LOGIN_WORKERS, thread_name_prefix="bot-login"
+)
+logins_pending = Gauge(
+    "bot_logins_pending", "Bots waiting for a Selenium login", registry=registry
+)
+logins_pending.set_function(
+    lambda: sum(1 for bot in list(bots.values()) if bot.state == "logging_in")
+)
+processes = ProcessSupervisor(aio_loop)
+supervisor = BotSupervisor(aio_loop)
+workers = WorkerPool(cfg.WORKER_PROCESSES or None)
+forkserver = WorkerPool(size=1, script=ZYGOTE_SCRIPT)
+start_latency = Histogram(
+    "bot_start_seconds",
+    "Time to launch a bot",
+    ["runner"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry,
+)
+running_gauge.set_function(
+    lambda: sum(len(runner) for runner in (supervisor, processes, workers, forkserver))
+)
+
+
+def _bot_exited(
+    socketio: SocketIO, bot_id: int, state: str, error: Optional[str]
+) -> None:
+    if state == "error":
+        errors_counter.inc()
+        logger.error("bot %s failed: %s", bot_id, error)
+        if cfg.SLACK_WEBHOOK:
+            notify_webhook(cfg.SLACK_WEBHOOK, f"Bot {bot_id} failed: {error}")
+        socketio.emit("bot_error", {"id": bot_id, "error": error})
+    else:
+        socketio.emit("bot_stopped", {"id": bot_id})
+
+
+def watch_exits(socketio: SocketIO) -> None:
+    """Emit ``bot_stopped``/``bot_error`` when a runner reports a real exit."""
+    for runner in (supervisor, processes, workers, forkserver):
+        runner.on_exit = partial(_bot_exited, socketio)
+
+
+@dataclass(frozen=True)
+class GroupRow:
+    id: int
+    name: str
+    target: str
+    interval: int
+
+
+@dataclass(frozen=True)
+class AccountRow:
+    id: int
+    username: str
+    password: str
+    proxy: Optional[str]
+    messages_file: Optional[str]
+    group_id: int
+    token_kind: str
+
+
+SnapshotEntry = Tuple[AccountRow, GroupRow]
+
+
+def _rows(account: Account, group: Group) -> SnapshotEntry:
+    return (
+        AccountRow(
+            id=account.id,
+            username=account.username,
+            password=account.password,
+            proxy=account.proxy,
+            messages_file=account.messages_file,
+            group_id=account.group_id,
+            token_kind=account.token.kind,
+        ),
+        GroupRow(
+            id=group.id,
+            name=group.name,
+            target=group.target,
+            interval=group.interval or 600,
+        ),
+    )
+
+
+class AccountSnapshot:
+    """In-memory account/group view shared by scheduler ticks.
+
+    Entries are loaded with a single joined query and dropped when
+    ``log_sync_event`` reports a change to the account or its group; misses
+    fall back to one joined lookup. Callers need an app context.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, SnapshotEntry] = {}
+        self._loaded = False
+        self._lock = Lock()
+
+    def load(self) -> List[SnapshotEntry]:
+        rows = (
+            db.session.query(Account, Group)
+            .join(Group, Account.group_id == Group.id)
+            .all()
+        )
+        entries = {acc.id: _rows(acc, grp) for acc, grp in rows}
+        with self._lock:
+            self._entries = entries
+            self._loaded = True
+        return list(entries.values())
+
+    def get(self, account_id: int) -> Optional[SnapshotEntry]:
+        with self._lock:
+            entry = self._entries.get(account_id)
+            loaded = self._loaded
+        if entry is not None:
+            return entry
+        if not loaded:
+            self.load()
+            with self._lock:
+                return self._entries.get(account_id)
+        row = (
+            db.session.query(Account, Group)
+            .join(Group, Account.group_id == Group.id)
+            .filter(Account.id == account_id)
+            .first()
+        )
+        if row is None:
+            return None
+        entry = _rows(*row)
+        with self._lock:
+            self._entries[account_id] = entry
+        return entry
+
+    def get_many(self, account_ids: List[int]) -> List[SnapshotEntry]:
+        with self._lock:
+            if not self._loaded:
+                missing = None
+            else:
+                missing = [a for a in account_ids if a not in self._entries]
+        if missing is None:
+            self.load()
+        elif missing:
+            rows = (
+                db.session.query(Account, Group)
+                .join(Group, Account.group_id == Group.id)
+                .filter(Account.id.in_(missing))
+                .all()
+            )
+            with self._lock:
+                for acc, grp in rows:
+                    self._entries[acc.id] = _rows(acc, grp)
+        with self._lock:
+            return [self._entries[a] for a in account_ids if a in self._entries]
+
+    def invalidate(self, entity: str, payload: Optional[dict] = None) -> None:
+        key = (payload or {}).get("id")
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._loaded = False
+            elif entity == "account":
+                self._entries.pop(key, None)
+            elif entity == "group":
+                for aid in [a for a, e in self._entries.items() if e[1].id == key]:
+                    del self._entries[aid]
+
+    def clear(self) -> None:
+        self.invalidate("all")
+
+
+snapshot = AccountSnapshot()
 
 
 def _bot_log_dir(app: Flask) -> Path:
@@ -98,6 +439,8 @@ def log_sync_event(entity: str, action: str, payload: dict, socketio: SocketIO)
     )
     db.session.add(evt)
     db.session.commit()
+    if entity in {"account", "group"}:
+        snapshot.invalidate(entity, payload)
     socketio.emit(
         "sync_event",
         {
@@ -110,141 +453,249 @@ def log_sync_event(entity: str, action: str, payload: dict, socketio: SocketIO)
     )
 
 
+def bot_spec(
+    app: Flask, account: AccountRow, group: GroupRow, test_mode: str
+) -> BotSpec:
+    return BotSpec(
+        bot_id=account.id,
+        channel=group.target,
+        message=messages.first(account.messages_file),
+        interval=group.interval,
+        token=account.password,
+        test_mode=test_mode,
+        log_dir=str(_bot_log_dir(app)),
+        store_path=str(_local_mock_path(app)),
+    )
+
+
 def run_bot_task(bot_id: int, socketio: SocketIO) -> None:
     logger.info("starting bot task %s", bot_id)
     app = APP or current_app
-    with app.app_context():
-        account = Account.query.get(bot_id)
-        if not account:
-            return
-        group = Group.query.get(account.group_id)
-        if not group:
-            return
-    msg = "Hello from KickBot"
-    msg_path = Path(account.messages_file or "")
-    if msg_path.is_file():
-        lines = msg_path.read_text(errors="ignore").splitlines()
-        if lines:
-            msg = lines[0]
-    cmd = [
-        sys.executable,
-        str(Path(__file__).resolve().parent.parent / "scripts" / "run_bot.py"),
-        "--channel",
-        group.target,
-        "--message",
-        msg,
-        "--interval",
-        str(group.interval),
-        "--bot-id",
-        str(account.id),
-        "--log-dir",
-        str(_bot_log_dir(app)),
-        "--test-mode",
-        (
-            "local"
-            if token_info(account.password).kind == "cookie"
-            or app.config.get("TESTING")
-            else "auto"
-        ),
-    ]
-    env = {**os.environ, "KICK_BOT_TOKEN": account.password}
-    env["KICK_BOT_ID"] = str(account.id)
-    env["LOCAL_KICK_MOCK_FILE"] = str(_local_mock_path(app))
+    with background_context(app):
+        entry = snapshot.get(bot_id)
+    if entry is None:
+        return
+    account, group = entry
+    test_mode = (
+        "local"
+        if account.token_kind == "cookie" or app.config.get("TESTING")
+        else "auto"
+    )
+    spec = bot_spec(app, account, group, test_mode)
     runs_counter.inc()
     try:
-        subprocess.run(cmd, check=True, env=env)
-        socketio.emit("bot_stopped", {"id": bot_id})
+        with start_latency.labels(get_setting(app, "BOT_RUNNER")).time():
+            bot_runner(app).start(spec)
     except Exception as exc:  # noqa: broad-except
-        errors_counter.inc()
-        logger.error("bot run failed: %s", exc)
-        webhook = cfg.SLACK_WEBHOOK
-        if webhook:
-            notify_webhook(webhook, f"Bot {bot_id} failed: {exc}")
-        socketio.emit("bot_error", {"id": bot_id})
+        _bot_exited(socketio, bot_id, "error", f"launch failed: {exc}")
+
+
+def _remove_bot_jobs() -> None:
+    # keep coarse jobs such as ``sync_sender`` registered by create_app
+    for job in sched.get_jobs():
+        if job.id.isdigit() or job.id.startswith("group-"):
+            job.remove()
+    wheel.clear()
+
+
+def get_setting(app: Flask, name: str):
+    return app.config.get(name, getattr(cfg, name))
+
+
+def bot_runner(app: Flask):
+    """Return the runner for ``BOT_RUNNER``; anything else runs subprocesses."""
+    return {
+        "inprocess": supervisor,
+        "worker": workers,
+        "prefork": forkserver,
+    }.get(get_setting(app, "BOT_RUNNER"), processes)
+
+
+# the loop only keeps weak references to tasks, so ticks are held here
+_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(factory) -> None:
+    """Run ``factory()`` as a task on ``aio_loop``; call from the loop thread."""
+    task = aio_loop.create_task(factory())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    task.add_done_callback(_tick_done)
+
+
+def _tick_done(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("bot tick failed", exc_info=task.exception())
+
+
+def _add_tick(app: Flask, job_id: str, seconds: int, factory) -> None:
+    """Register a periodic bot tick on the configured scheduler backend."""
+    if get_setting(app, "SCHEDULER_BACKEND") == "wheel":
+        # wheel callbacks already run on aio_loop
+        wheel.schedule(job_id, seconds, partial(_spawn, factory))
+        wheel.start(aio_loop)
+        return
+    sched.add_job(
+        lambda: aio_loop.call_soon_threadsafe(_spawn, factory),
+        "interval",
+        seconds=seconds,
+        id=job_id,
+        replace_existing=True,
+    )
 
 
 def schedule_all(socketio: SocketIO) -> None:
-    sched.remove_all_jobs()
-    for acc in Account.query.all():
-        group = Group.query.get(acc.group_id)
-        if not group:
-            continue
+    app = APP or current_app
+    _remove_bot_jobs()
+    entries = snapshot.load()
+    if get_setting(app, "SCHEDULER_MODE") == "group":
+        _schedule_groups(app, entries, socketio)
+        return
+    for acc, group in entries:
         try:
-            sched.add_job(
-                lambda aid=acc.id: asyncio.run_coroutine_threadsafe(
-                    send_job(aid, socketio), aio_loop
-                ),
-                "interval",
-                seconds=group.interval,
-                id=str(acc.id),
-                replace_existing=True,
+            _add_tick(
+                app,
+                str(acc.id),
+                group.interval,
+                lambda aid=acc.id: send_job(aid, socketio),
             )
         except Exception as exc:  # noqa: broad-except
             logger.error("could not schedule job %s: %s", acc.id, exc)
 
 
-async def send_job(account_id: int, socketio: SocketIO) -> None:
-    app = APP or current_app
-    with app.app_context():
-        account = Account.query.get(account_id)
-        if not account:
-            return
-        group = Group.query.get(account.group_id)
-        if not group:
-            return
-        message = "Hello from KickBot"
-        msg_path = Path(account.messages_file or "").expanduser()
-        if msg_path.is_file():
-            with open(msg_path) as fh:
-                line = fh.readline().strip()
-                if line:
-                    message = line
-        info = token_info(account.password)
-        if info.kind == "cookie" or app.config.get("TESTING"):
-            mode = "local_cookie_test" if info.kind == "cookie" else "local_test"
-            adapter = LocalKickMockAdapter(path=_local_mock_path(app))
-            adapter.ensure_account(str(account_id), account.username)
-            result = adapter.send_message(str(account_id), group.target, message)
-            socketio.emit("bot_started", {"id": account_id, "mode": mode})
-            _append_bot_log(
+def _schedule_groups(
+    app: Flask, entries: List[SnapshotEntry], socketio: SocketIO
+) -> None:
+    members: Dict[int, List[int]] = {}
+    intervals: Dict[int, int] = {}
+    for acc, group in entries:
+        members.setdefault(group.id, []).append(acc.id)
+        intervals[group.id] = group.interval
+    for gid, account_ids in members.items():
+        try:
+            _add_tick(
                 app,
-                account_id,
-                "stage=scheduler_simulated "
-                f"mode={mode} token_kind={info.kind} "
-                f"status={result.status} code={result.code} "
-                f"event_id={result.event_id}",
-            )
-            log = Log(account_id=account_id, message="scheduler local test")
-            db.session.add(log)
-            db.session.commit()
-            socketio.emit("bot_stopped", {"id": account_id, "mode": mode})
-            socketio.emit(
-                "status",
-                {"message": f"local test scheduler tick for {account_id}"},
+                f"group-{gid}",
+                intervals[gid],
+                lambda ids=account_ids: send_group_job(ids, socketio),
             )
+        except Exception as exc:  # noqa: broad-except
+            logger.error("could not schedule group job %s: %s", gid, exc)
+
+
+def _local_mode(app: Flask, account: AccountRow) -> Optional[str]:
+    kind = account.token_kind
+    if kind == "cookie":
+        return "local_cookie_test"
+    if app.config.get("TESTING"):
+        return "local_test"
+    return None
+
+
+def _local_ticks(
+    app: Flask,
+    entries: List[Tuple[AccountRow, GroupRow, str]],
+    socketio: SocketIO,
+) -> futures.Future:
+    """Run simulated sends for ``entries`` in one mock-store transaction.
+
+    Returns the ``log_buffer`` backpressure future for their ``Log`` rows.
+    """
+    adapter = LocalKickMockAdapter(path=_local_mock_path(app))
+    adapter.ensure_accounts([(str(acc.id), acc.username) for acc, _, _ in entries])
+    results = adapter.send_many(
+        [(str(acc.id), group.target, message) for acc, group, message in entries]
+    )
+    modes = []
+    for (account, _, _), result in zip(entries, results):
+        mode = _local_mode(app, account)
+        modes.append(mode)
+        socketio.emit("bot_started", {"id": account.id, "mode": mode})
+        _append_bot_log(
+            app,
+            account.id,
+            "stage=scheduler_simulated "
+            f"mode={mode} token_kind={account.token_kind} "
+            f"status={result.status} code={result.code} "
+            f"event_id={result.event_id}",
+        )
+    written = log_buffer.add(
+        app, [(account.id, "scheduler local test") for account, _, _ in entries]
+    )
+    for (account, _, _), mode in zip(entries, modes):
+        socketio.emit("bot_stopped", {"id": account.id, "mode": mode})
+        socketio.emit(
+            "status",
+            {"message": f"local test scheduler tick for {account.id}"},
+        )
+    return written
+
+
+async def send_group_job(account_ids: List[int], socketio: SocketIO) -> None:
+    """Fan one group tick out to its accounts in jittered batches."""
+    app = APP or current_app
+    batch_size = max(1, int(get_setting(app, "SCHEDULER_BATCH_SIZE")))
+    jitter = float(get_setting(app, "SCHEDULER_JITTER_SECONDS"))
+    limit = asyncio.Semaphore(max(1, int(get_setting(app, "SCHEDULER_CONCURRENCY"))))
+
+    async def send_live(account_id: int) -> None:
+        async with limit:
+            await send_job(account_id, socketio)
+
+    for start in range(0, len(account_ids), batch_size):
+        if jitter > 0:
+            await asyncio.sleep(random.uniform(0, jitter))
+        end = start + batch_size
+        batch = account_ids[start:end]
+        local, live, written = [], [], None
+        with background_context(app):
+            for account, group in snapshot.get_many(batch):
+                if _local_mode(app, account):
+                    message = messages.next(account.messages_file, account.id)
+                    local.append((account, group, message))
+                else:
+                    live.append(account.id)
+            if local:
+                written = _local_ticks(app, local, socketio)
+        if written is not None:
+            await asyncio.wrap_future(written)
+        if live:
+            await asyncio.gather(*(send_live(aid) for aid in live))
+
+
+async def send_job(account_id: int, socketio: SocketIO) -> None:
+    app = APP or current_app
+    with background_context(app):
+        entry = snapshot.get(account_id)
+        if entry is None:
             return
-        if account_id not in bots:
+        account, group = entry
+        message = messages.next(account.messages_file, account_id)
+        written = None
+        if _local_mode(app, account):
+            written = _local_ticks(app, [(account, group, message)], socketio)
+        elif account_id not in bots:
             bots[account_id] = BotInstance(account, group)
-            bots[account_id].login()
-        bot = bots[account_id]
+        bot = bots.get(account_id)
+    if written is not None:
+        await asyncio.wrap_future(written)
+        return
     socketio.emit("bot_started", {"id": account_id})
     try:
+        await bot.ensure_login(login_executor)
         await bot.send_message(message)
         socketio.emit("bot_stopped", {"id": account_id})
     except Exception as exc:  # noqa: broad-except
         errors_counter.inc()
         logger.error("send job failed: %s", exc)
         socketio.emit("bot_error", {"id": account_id})
-    with app.app_context():
-        log = Log(account_id=account_id, message=message)
-        db.session.add(log)
-        db.session.commit()
+    await asyncio.wrap_future(log_buffer.add(app, [(account_id, message)]))
     socketio.emit("status", {"message": f"sent message for {account_id}"})
 
 
 def process_unsent_events(socketio: SocketIO) -> None:
     app = APP or current_app
-    with app.app_context():
+    with background_context(app):
         events = SyncEvent.query.filter_by(synced=False).all()
         for evt in events:
             socketio.emit(
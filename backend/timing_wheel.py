@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from threading import Lock
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+
+from shared.logger import logger
+
+Callback = Callable[[], object]
+# absorbs float error so a deadline on a tick boundary fires on that tick
+EPSILON = 1e-9
+
+
+class TimerHandle:
+    __slots__ = ("key", "interval", "deadline", "callback", "bucket", "fired", "missed")
+
+    def __init__(self, key: Hashable, interval: float, deadline: float, callback):
+        self.key = key
+        self.interval = interval
+        self.deadline = deadline
+        self.callback = callback
+        self.bucket: Optional[dict] = None
+        self.fired = 0
+        self.missed = 0
+
+
+class TimingWheel:
+    """Hierarchical timing wheel for periodic bot ticks.
+
+    Timers live in ``levels`` wheels of ``slots`` buckets each; level ``n``
+    covers ``slots ** (n + 1)`` ticks and cascades into the level below as
+    time advances. Buckets are dicts, so insert and cancel are O(1).
+
+    Periodic timers are re-armed from their previous deadline rather than
+    from the time they actually ran, so a late loop does not accumulate
+    drift. When the loop falls behind by more than one interval the missed
+    ticks are coalesced into a single callback and counted in ``missed``.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        slots: int = 64,
+        levels: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels: List[List[dict]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._timers: Dict[Hashable, TimerHandle] = {}
+        self._origin = clock()
+        self._current = 0
+        self._lock = Lock()
+        self._task: Optional[asyncio.Future] = None
+        self.fired = 0
+        self.missed = 0
+        self.lag = 0.0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def _tick_of(self, when: float) -> int:
+        return int((when - self._origin) / self.tick + EPSILON)
+
+    def _place(self, handle: TimerHandle, earliest: Optional[int] = None) -> None:
+        due = math.ceil((handle.deadline - self._origin) / self.tick - EPSILON)
+        target = max(due, self._current + 1 if earliest is None else earliest)
+        delta = target - self._current
+        level = 0
+        while level < self.levels - 1 and delta >= 1 << (self._bits * (level + 1)):
+            level += 1
+        span = 1 << (self._bits * (level + 1))
+        if delta >= span:
+            # beyond the top wheel: park in the furthest bucket and re-cascade
+            target = self._current + span - 1
+        slot = (target >> (self._bits * level)) & self._mask
+        bucket = self._wheels[level][slot]
+        bucket[handle] = None
+        handle.bucket = bucket
+
+    def schedule(
+        self,
+        key: Hashable,
+        interval: float,
+        callback: Callback,
+        delay: Optional[float] = None,
+    ) -> TimerHandle:
+        """Run ``callback`` every ``interval`` seconds, replacing ``key``."""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        with self._lock:
+            self._cancel(key)
+            first = interval if delay is None else delay
+            handle = TimerHandle(key, interval, self.clock() + first, callback)
+            self._timers[key] = handle
+            self._place(handle)
+            return handle
+
+    def _cancel(self, key: Hashable) -> bool:
+        handle = self._timers.pop(key, None)
+        if handle is None:
+            return False
+        if handle.bucket is not None:
+            handle.bucket.pop(handle, None)
+            handle.bucket = None
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._cancel(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._timers):
+                self._cancel(key)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._timers)
+
+    def advance(self, now: Optional[float] = None) -> List[TimerHandle]:
+        """Advance the wheel to ``now`` and run every expired callback."""
+        now = self.clock() if now is None else now
+        due: List[TimerHandle] = []
+        with self._lock:
+            target = self._tick_of(now)
+            while self._current < target:
+                self._current += 1
+                self._cascade()
+                bucket = self._wheels[0][self._current & self._mask]
+                if not bucket:
+                    continue
+                expired = list(bucket)
+                bucket.clear()
+                for handle in expired:
+                    handle.bucket = None
+                    if handle.deadline > now + EPSILON:
+                        self._place(handle)
+                        continue
+                    self._rearm(handle, now)
+                    due.append(handle)
+        for handle in due:
+            self.lag = max(0.0, now - handle.deadline)
+            try:
+                handle.callback()
+            except Exception as exc:  # noqa: broad-except
+                logger.error("timer %s failed: %s", handle.key, exc)
+        self.fired += len(due)
+        return due
+
+    def _cascade(self) -> None:
+        top = 0
+        for level in range(1, self.levels):
+            if self._current & ((1 << (self._bits * level)) - 1):
+                break
+            top = level
+        # highest level first so timers can fall through several wheels
+        for level in range(top, 0, -1):
+            shift = self._bits * level
+            bucket = self._wheels[level][(self._current >> shift) & self._mask]
+            moved = list(bucket)
+            bucket.clear()
+            for handle in moved:
+                self._place(handle, self._current)
+
+    def _rearm(self, handle: TimerHandle, now: float) -> None:
+        missed = max(0, int((now - handle.deadline) / handle.interval + EPSILON))
+        handle.missed += missed
+        self.missed += missed
+        handle.fired += 1
+        handle.deadline += handle.interval * (missed + 1)
+        self._place(handle)
+
+    async def run(self) -> None:
+        while True:
+            wake = self._origin + (self._current + 1) * self.tick
+            await asyncio.sleep(max(0.0, wake - self.clock()))
+            self.advance()
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.run_coroutine_threadsafe(self.run(), loop)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
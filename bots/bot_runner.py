@@ -10,7 +10,7 @@ import time
 
 from shared.logger import logger
 from shared.cache import cache
-from .webdriver_pool import get_driver, release_driver
+from .webdriver_pool import get_driver, pool, release_driver
 
 DATA_FILE = Path(__file__).resolve().parent.parent / "data.json"
 
@@ -108,10 +108,12 @@ def main(group: str | None = None):
     else:
         account_ids = list(accounts)
 
-    for aid in account_ids:
-        acc = accounts.get(aid)
-        if acc:
-            run_account(acc)
+    selected = [accounts[aid] for aid in account_ids if aid in accounts]
+    # accounts run one at a time, so one ready driver per proxy is enough
+    for proxy in {acc.get("proxy") for acc in selected}:
+        pool.warm(proxy, count=1)
+    for acc in selected:
+        run_account(acc)
 
 
 if __name__ == "__main__":
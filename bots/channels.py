@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+from threading import Lock
+from typing import Dict, Optional, Set
+
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from websockets.protocol import State
+
+from shared.logger import logger
+
+WS_URI = os.getenv("KICK_WS_URI", "wss://chat.kick.com/channel/{target}")
+# frames a subscriber may fall behind by before it is dropped
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# the loop only keeps weak references to tasks, so resets are held here
+_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(factory) -> None:
+    """Run ``factory()`` as a task on the current loop; call from its thread."""
+    task = asyncio.get_running_loop().create_task(factory())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    task.add_done_callback(_task_done)
+
+
+def _task_done(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("channel task failed", exc_info=task.exception())
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class ChannelConnection:
+    """One chat websocket shared by every bot that targets the channel.
+
+    Sends are serialized on the socket, incoming frames are fanned out to
+    subscriber queues by a single reader task, and a dropped socket is
+    reopened lazily with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.url = url
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.ws: Optional[ClientConnection] = None
+        self.refs = 0
+        self.connects = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._send_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.ws is not None and self.ws.state is State.OPEN
+
+    async def ensure(self) -> ClientConnection:
+        if self.is_open:
+            return self.ws
+        if self._connect_lock is None:
+            self.loop = asyncio.get_running_loop()
+            self._connect_lock = asyncio.Lock()
+            self._send_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.is_open:
+                return self.ws
+            for attempt in range(self.attempts):
+                if attempt:
+                    await asyncio.sleep(
+                        backoff_delay(attempt - 1, self.backoff_base, self.backoff_max)
+                    )
+                try:
+                    self.ws = await connect(self.url, ping_interval=20, ping_timeout=20)
+                except (OSError, asyncio.TimeoutError, WebSocketException) as exc:
+                    self.last_error = str(exc)
+                    logger.warning("channel %s connect error: %s", self.url, exc)
+                    continue
+                self.connects += 1
+                self._reader = asyncio.create_task(self._read(self.ws))
+                return self.ws
+        raise ConnectionError(f"unable to connect to {self.url}")
+
+    async def send(self, message: str) -> None:
+        ws = await self.ensure()
+        async with self._send_lock:
+            await ws.send(message)
+
+    async def reset(self) -> None:
+        """Drop the current socket; the next send reconnects."""
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            await ws.close()
+
+    def subscribe(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> asyncio.Queue:
+        """Queue receiving every incoming frame.
+
+        A subscriber that lets ``maxsize`` frames pile up is dropped: its
+        backlog is discarded and it receives ``None`` instead.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _drop(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        self.dropped += 1
+        logger.warning("channel %s dropped a slow subscriber", self.url)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _read(self, ws: ClientConnection) -> None:
+        try:
+            async for frame in ws:
+                for queue in list(self._subscribers):
+                    try:
+                        queue.put_nowait(frame)
+                    except asyncio.QueueFull:
+                        self._drop(queue)
+        except ConnectionClosed as exc:
+            self.last_error = str(exc)
+        if self.ws is ws:
+            self.ws = None
+
+
+class ChannelManager:
+    """Reference-counted registry of :class:`ChannelConnection` by target."""
+
+    def __init__(self, uri_template: Optional[str] = None, **options):
+        self.uri_template = uri_template
+        self.options = options
+        self._channels: Dict[str, ChannelConnection] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._channels)
+
+    def open_count(self) -> int:
+        with self._lock:
+            return sum(1 for channel in self._channels.values() if channel.is_open)
+
+    def acquire(self, target: str) -> ChannelConnection:
+        with self._lock:
+            channel = self._channels.get(target)
+            if channel is None:
+                url = (self.uri_template or WS_URI).format(target=target)
+                channel = self._channels[target] = ChannelConnection(
+                    url, **self.options
+                )
+            channel.refs += 1
+            return channel
+
+    def release(self, target: str) -> None:
+        """Drop a reference; the last one closes the socket."""
+        with self._lock:
+            channel = self._channels.get(target)
+            if channel is None:
+                return
+            channel.refs -= 1
+            if channel.refs > 0:
+                return
+            del self._channels[target]
+        loop = channel.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(_spawn, channel.reset)
+
+    async def close_all(self) -> None:
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+        for channel in channels:
+            await channel.reset()
+
+
+channels = ChannelManager()
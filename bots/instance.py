@@ -1,20 +1,19 @@
 import asyncio
-import os
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Optional
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
-import websockets
 
+from bots.channels import WS_URI, channels  # noqa: F401  WS_URI re-exported
+from bots.webdriver_pool import get_driver, release_driver
 from shared.kick_tokens import looks_like_cookie_token
 from shared.logger import get_bot_logger
 
-WS_URI = os.getenv("KICK_WS_URI", "wss://chat.kick.com/channel/{target}")
 BASE_URL = "https://kick.com"
 
 
@@ -25,34 +24,49 @@ class BotInstance:
         self.account = account
         self.group = group
         self.driver: Optional[webdriver.Chrome] = None
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.channel = channels.acquire(group.target)
         self.log = get_bot_logger(account.id)
-        self._lock = asyncio.Lock()
+        self.state = "new"
+        self.queued = 0
+        self._login: Optional[asyncio.Future] = None
+
+    @property
+    def ws(self):
+        return self.channel.ws
+
+    @property
+    def online(self) -> bool:
+        return self.channel.is_open
 
     def _init_driver(self):
-        opts = Options()
-        opts.add_argument("--headless")
-        opts.add_argument("--disable-gpu")
-        opts.add_argument("--disable-extensions")
-        opts.add_argument("--start-maximized")
-        if self.account.proxy:
-            opts.add_argument(f"--proxy-server={self.account.proxy}")
-        self.driver = webdriver.Chrome(options=opts)
+        self.driver = get_driver(self.account.proxy)
 
     async def connect(self):
-        if self.ws and not self.ws.closed:
+        await self.channel.ensure()
+
+    async def ensure_login(self, executor: Optional[Executor] = None) -> None:
+        """Run :meth:`login` on ``executor`` without blocking the event loop.
+
+        The bot stays in ``logging_in`` until the attempt finishes; callers
+        arriving meanwhile wait on the same attempt instead of starting one.
+        """
+        if self.state == "ready":
             return
-        url = WS_URI.format(target=self.group.target)
-        for _ in range(3):
-            try:
-                self.ws = await websockets.connect(
-                    url, ping_interval=20, ping_timeout=20
-                )
-                return
-            except Exception as exc:
-                self.log.warning("connect error: %s", exc)
-                await asyncio.sleep(5)
-        raise ConnectionError("Unable to connect")
+        if self._login is None:
+            self.state = "logging_in"
+            self._login = asyncio.get_running_loop().run_in_executor(
+                executor, self.login
+            )
+        self.queued += 1
+        try:
+            await asyncio.shield(self._login)
+        except Exception:
+            self.state = "error"
+            self._login = None
+            raise
+        finally:
+            self.queued -= 1
+        self.state = "ready"
 
     def login(self):
         if looks_like_cookie_token(self.account.password):
@@ -111,25 +125,29 @@ class BotInstance:
     async def send_message(self, message: str):
         for attempt in range(2):
             try:
-                await self.connect()
-                async with self._lock:
-                    await self.ws.send(message)
+                await self.channel.send(message)
                 self.log.info("sent message: %s", message)
                 return
             except Exception as exc:
                 self.log.warning("send error: %s", exc)
-                await self.restart()
+                await self.channel.reset()
         raise ConnectionError("send failed after reconnect")
 
     async def status_check(self):
         await self.connect()
-        return not self.ws.closed
+        return self.online
 
     async def restart(self):
-        if self.ws:
-            await self.ws.close()
+        await self.channel.reset()
         await self.connect()
 
+    def release(self) -> None:
+        """Give up this bot's channel share and return its driver to the pool."""
+        channels.release(self.group.target)
+        if self.driver is not None:
+            release_driver(self.driver)
+            self.driver = None
+
     def screenshot(self, folder="screenshots"):
         Path(folder).mkdir(exist_ok=True)
         path = Path(folder) / f"{self.account.id}.png"
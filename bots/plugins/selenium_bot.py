@@ -10,13 +10,10 @@ class SeleniumAdapter:
         self.instance.login()
 
     def stop(self) -> None:
-        if self.instance.ws:
-            self.instance.ws.close()
+        self.instance.release()
 
     def status(self) -> str:
-        return (
-            "online" if self.instance.ws and not self.instance.ws.closed else "offline"
-        )
+        return "online" if self.instance.online else "offline"
 
 
 register("selenium", SeleniumAdapter)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import os
+import signal
+import subprocess
+from threading import Lock
+import time
+from typing import Dict, List, Optional
+
+from bots.supervisor import BotSpec, ExitCallback
+from shared.logger import logger
+
+
+@dataclass
+class ProcessRun:
+    spec: BotSpec
+    proc: subprocess.Popen
+    started_at: float = field(default_factory=time.time)
+    restarts: int = 0
+    state: str = "running"
+    returncode: Optional[int] = None
+    error: Optional[str] = None
+    stop_requested: bool = False
+
+    def running(self) -> bool:
+        return self.state == "running"
+
+
+class ProcessSupervisor:
+    """Run one ``run_bot.py`` subprocess per bot.
+
+    Exits are reaped on ``loop`` through a pidfd (or a waiter thread where
+    pidfds are unavailable) and recorded in an in-memory table, so status
+    lookups never poll the child.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, on_exit: Optional[ExitCallback] = None
+    ):
+        self.loop = loop
+        self.on_exit = on_exit
+        self._runs: Dict[int, ProcessRun] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for run in self._runs.values() if run.running())
+
+    def start(self, spec: BotSpec) -> tuple[ProcessRun, bool]:
+        with self._lock:
+            current = self._runs.get(spec.bot_id)
+            if current is not None and current.running():
+                return current, False
+            run = ProcessRun(spec, subprocess.Popen(spec.command(), env=spec.env()))
+            if current is not None:
+                run.restarts = current.restarts + 1
+            self._runs[spec.bot_id] = run
+        self.loop.call_soon_threadsafe(self._watch, run)
+        return run, True
+
+    def stop(self, bot_id: int) -> bool:
+        with self._lock:
+            run = self._runs.get(bot_id)
+            if run is None or not run.running():
+                return False
+            run.stop_requested = True
+        try:
+            run.proc.send_signal(signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        return True
+
+    def is_running(self, bot_id: int) -> bool:
+        with self._lock:
+            run = self._runs.get(bot_id)
+        return run is not None and run.running()
+
+    def get(self, bot_id: int) -> Optional[ProcessRun]:
+        with self._lock:
+            return self._runs.get(bot_id)
+
+    def status(self, bot_id: int) -> dict:
+        run = self.get(bot_id)
+        return {
+            "running": run is not None and run.running(),
+            "pid": run.proc.pid if run else None,
+            "returncode": run.returncode if run else None,
+            "state": run.state if run else "idle",
+            "restarts": run.restarts if run else 0,
+            "error": run.error if run else None,
+        }
+
+    def running_ids(self) -> List[int]:
+        with self._lock:
+            return [bot_id for bot_id, run in self._runs.items() if run.running()]
+
+    def stop_all(self) -> None:
+        with self._lock:
+            bot_ids = list(self._runs)
+        for bot_id in bot_ids:
+            self.stop(bot_id)
+
+    def _watch(self, run: ProcessRun) -> None:
+        try:
+            fd = os.pidfd_open(run.proc.pid)
+        except (AttributeError, OSError):
+            self.loop.create_task(self._wait(run))
+            return
+        self.loop.add_reader(fd, self._reap, run, fd)
+
+    def _reap(self, run: ProcessRun, fd: int) -> None:
+        self.loop.remove_reader(fd)
+        os.close(fd)
+        self._exited(run, run.proc.wait())
+
+    async def _wait(self, run: ProcessRun) -> None:
+        self._exited(run, await asyncio.to_thread(run.proc.wait))
+
+    def _exited(self, run: ProcessRun, returncode: int) -> None:
+        with self._lock:
+            run.returncode = returncode
+            if returncode == 0 or run.stop_requested:
+                run.state = "stopped"
+            else:
+                run.state = "error"
+                run.error = f"exit code {returncode}"
+        if run.error:
+            logger.error("bot %s exited: %s", run.spec.bot_id, run.error)
+        if self.on_exit is not None:
+            self.on_exit(run.spec.bot_id, run.state, run.error)
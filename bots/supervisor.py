@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import sys
+from threading import Lock
+import time
+from typing import Callable, Dict, List, Optional
+
+from scripts.run_bot import send_loop
+from shared.logger import bot_log, logger
+
+RUN_BOT_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "run_bot.py"
+
+# called with (bot_id, state, error) once a bot has really exited
+ExitCallback = Callable[[int, str, Optional[str]], None]
+
+
+@dataclass(frozen=True)
+class BotSpec:
+    """Everything needed to run one bot's send loop."""
+
+    bot_id: int
+    channel: str
+    message: str
+    interval: int
+    token: str
+    test_mode: str
+    log_dir: str
+    store_path: str
+
+    def command(self) -> List[str]:
+        return [
+            sys.executable,
+            str(RUN_BOT_SCRIPT),
+            "--channel",
+            self.channel,
+            "--message",
+            self.message,
+            "--interval",
+            str(self.interval),
+            "--bot-id",
+            str(self.bot_id),
+            "--log-dir",
+            self.log_dir,
+            "--test-mode",
+            self.test_mode,
+        ]
+
+    def env(self) -> Dict[str, str]:
+        env = {**os.environ, "KICK_BOT_TOKEN": self.token}
+        env["KICK_BOT_ID"] = str(self.bot_id)
+        env["LOCAL_KICK_MOCK_FILE"] = self.store_path
+        return env
+
+
+@dataclass
+class BotRun:
+    spec: BotSpec
+    future: Future
+    started_at: float = field(default_factory=time.time)
+    restarts: int = 0
+    state: str = "running"
+    error: Optional[str] = None
+
+    def running(self) -> bool:
+        return not self.future.done()
+
+
+class BotSupervisor:
+    """Run bot send loops as coroutines on a shared event loop.
+
+    Each bot is a task on ``loop`` instead of a separate interpreter, so a
+    single process can host thousands of bots. Methods are thread-safe and
+    may be called from request handlers.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, on_exit: Optional[ExitCallback] = None
+    ):
+        self.loop = loop
+        self.on_exit = on_exit
+        self._runs: Dict[int, BotRun] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for run in self._runs.values() if run.running())
+
+    def start(self, spec: BotSpec) -> tuple[BotRun, bool]:
+        """Start ``spec`` unless it is already running.
+
+        Returns the run and whether it was newly started.
+        """
+        with self._lock:
+            current = self._runs.get(spec.bot_id)
+            if current is not None and current.running():
+                return current, False
+            future = asyncio.run_coroutine_threadsafe(self._run(spec), self.loop)
+            run = BotRun(spec, future)
+            if current is not None:
+                run.restarts = current.restarts + 1
+            self._runs[spec.bot_id] = run
+        future.add_done_callback(lambda fut: self._finished(run, fut))
+        return run, True
+
+    def stop(self, bot_id: int) -> bool:
+        with self._lock:
+            run = self._runs.get(bot_id)
+        if run is None or not run.running():
+            return False
+        run.future.cancel()
+        return True
+
+    def restart(self, spec: BotSpec) -> BotRun:
+        self.stop(spec.bot_id)
+        run, _ = self.start(spec)
+        return run
+
+    def is_running(self, bot_id: int) -> bool:
+        with self._lock:
+            run = self._runs.get(bot_id)
+        return run is not None and run.running()
+
+    def get(self, bot_id: int) -> Optional[BotRun]:
+        with self._lock:
+            return self._runs.get(bot_id)
+
+    def status(self, bot_id: int) -> dict:
+        run = self.get(bot_id)
+        return {
+            "running": run is not None and run.running(),
+            "pid": os.getpid() if run else None,
+            "returncode": None,
+            "state": run.state if run else "idle",
+            "restarts": run.restarts if run else 0,
+            "error": run.error if run else None,
+        }
+
+    def running_ids(self) -> List[int]:
+        with self._lock:
+            return [bot_id for bot_id, run in self._runs.items() if run.running()]
+
+    def stop_all(self) -> None:
+        with self._lock:
+            bot_ids = list(self._runs)
+        for bot_id in bot_ids:
+            self.stop(bot_id)
+
+    async def _run(self, spec: BotSpec) -> None:
+        log = bot_log(spec.bot_id, spec.log_dir)
+        log(f"stage=start mode={spec.test_mode} runner=inprocess")
+        try:
+            await send_loop(
+                spec.channel,
+                spec.message,
+                spec.interval,
+                spec.token,
+                spec.test_mode,
+                log,
+                actor=f"bot-{spec.bot_id}",
+                local_store_path=spec.store_path,
+            )
+        except asyncio.CancelledError:
+            log("stage=stopped reason=supervisor")
+            raise
+
+    def _finished(self, run: BotRun, future: Future) -> None:
+        try:
+            future.result()
+            run.state = "stopped"
+        except CancelledError:
+            run.state = "stopped"
+        except Exception as exc:  # noqa: broad-except
+            run.state = "error"
+            run.error = f"{type(exc).__name__}: {exc}"
+            logger.error("bot %s crashed: %s", run.spec.bot_id, run.error)
+        if self.on_exit is not None:
+            self.on_exit(run.spec.bot_id, run.state, run.error)
@@ -1,11 +1,21 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import os
 from threading import Lock
+import time
+from typing import Callable, Dict, List, Optional
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-import os
 
-_pool: list[webdriver.Chrome] = []
-_lock = Lock()
+from shared.logger import logger
+
 MAX_DRIVERS = int(os.getenv("MAX_DRIVERS", "5"))
+MIN_IDLE_DRIVERS = int(os.getenv("MIN_IDLE_DRIVERS", "0"))
+DRIVER_IDLE_SECONDS = float(os.getenv("DRIVER_IDLE_SECONDS", "300"))
+DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES", "50"))
 
 
 def init_driver(proxy: str | None = None) -> webdriver.Chrome:
@@ -18,16 +28,191 @@ def init_driver(proxy: str | None = None) -> webdriver.Chrome:
     return webdriver.Chrome(options=opts)
 
 
+def is_alive(driver) -> bool:
+    try:
+        driver.current_url
+    except Exception:  # noqa: broad-except
+        return False
+    return True
+
+
+@dataclass
+class PooledDriver:
+    driver: webdriver.Chrome
+    key: str
+    created_at: float
+    last_used: float = 0.0
+    uses: int = 0
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    created: int = 0
+    evicted: int = 0
+    recycled: int = 0
+    dead: int = 0
+
+
+class WebDriverPool:
+    """Chrome drivers pooled per proxy.
+
+    Checkout never waits: a driver is created whenever no healthy idle one
+    exists for the proxy. At most ``max_size`` drivers are kept idle per
+    proxy; extra ones are quit on checkin. Idle drivers are probed before
+    checkout, evicted after ``idle_timeout`` seconds, and recycled after
+    ``max_uses`` checkouts so long-lived Chrome processes do not accumulate
+    state.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Optional[str]], webdriver.Chrome] = init_driver,
+        min_size: int = MIN_IDLE_DRIVERS,
+        max_size: int = MAX_DRIVERS,
+        idle_timeout: float = DRIVER_IDLE_SECONDS,
+        max_uses: int = DRIVER_MAX_USES,
+        probe: Callable[[webdriver.Chrome], bool] = is_alive,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self.probe = probe
+        self.clock = clock
+        self.stats = PoolStats()
+        self.observe_create: Optional[Callable[[float], None]] = None
+        self._idle: Dict[str, List[PooledDriver]] = defaultdict(list)
+        self._leased: Dict[int, PooledDriver] = {}
+        self._lock = Lock()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._idle.values())
+
+    def leased_count(self) -> int:
+        with self._lock:
+            return len(self._leased)
+
+    def checkout(self, proxy: str | None = None) -> webdriver.Chrome:
+        key = proxy or ""
+        while True:
+            with self._lock:
+                stale = self._evict_idle()
+                idle = self._idle[key]
+                entry = idle.pop() if idle else None
+                if entry is None:
+                    self.stats.misses += 1
+            # probe and quit outside the lock, a dead Chrome can be slow to answer
+            _quit(stale)
+            if entry is None:
+                break
+            if self.probe(entry.driver):
+                with self._lock:
+                    self.stats.hits += 1
+                    self._lease(entry)
+                return entry.driver
+            with self._lock:
+                self.stats.dead += 1
+            _quit([entry])
+        entry = self._create(key)
+        with self._lock:
+            self._lease(entry)
+        return entry.driver
+
+    def checkin(self, driver: webdriver.Chrome, healthy: bool = True) -> None:
+        with self._lock:
+            entry = self._leased.pop(id(driver), None)
+            if entry is None:
+                doomed = [PooledDriver(driver, "", created_at=0.0)]
+            elif not healthy or entry.uses >= self.max_uses:
+                if healthy:
+                    self.stats.recycled += 1
+                else:
+                    self.stats.dead += 1
+                doomed = [entry]
+            elif len(self._idle[entry.key]) >= self.max_size:
+                self.stats.evicted += 1
+                doomed = [entry]
+            else:
+                entry.last_used = self.clock()
+                self._idle[entry.key].append(entry)
+                doomed = []
+            doomed += self._evict_idle()
+        _quit(doomed)
+
+    def warm(self, proxy: str | None = None, count: int | None = None) -> int:
+        """Create idle drivers for ``proxy`` up to ``count`` (``min_size``)."""
+        key = proxy or ""
+        target = min(self.max_size, self.min_size if count is None else count)
+        created = 0
+        while True:
+            with self._lock:
+                if len(self._idle[key]) >= target:
+                    return created
+            entry = self._create(key)
+            with self._lock:
+                entry.last_used = self.clock()
+                self._idle[key].append(entry)
+            created += 1
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            stale = self._evict_idle()
+        _quit(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            entries = [e for idle in self._idle.values() for e in idle]
+            self._idle.clear()
+        _quit(entries)
+
+    def _create(self, key: str) -> PooledDriver:
+        started = time.perf_counter()
+        driver = self.factory(key or None)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stats.created += 1
+        if self.observe_create is not None:
+            self.observe_create(elapsed)
+        logger.info("started webdriver proxy=%s in %.2fs", key or "-", elapsed)
+        return PooledDriver(driver, key, created_at=self.clock())
+
+    def _lease(self, entry: PooledDriver) -> None:
+        entry.uses += 1
+        self._leased[id(entry.driver)] = entry
+
+    def _evict_idle(self) -> List[PooledDriver]:
+        cutoff = self.clock() - self.idle_timeout
+        stale: List[PooledDriver] = []
+        for idle in self._idle.values():
+            expired = [e for e in idle if e.last_used < cutoff]
+            # keep the warm minimum even if it has been idle for a while
+            for entry in expired[: max(0, len(idle) - self.min_size)]:
+                idle.remove(entry)
+                stale.append(entry)
+        self.stats.evicted += len(stale)
+        return stale
+
+
+def _quit(entries: List[PooledDriver]) -> None:
+    for entry in entries:
+        try:
+            entry.driver.quit()
+        except Exception as exc:  # noqa: broad-except
+            logger.warning("webdriver quit failed: %s", exc)
+
+
+pool = WebDriverPool()
+
+
 def get_driver(proxy: str | None = None) -> webdriver.Chrome:
-    with _lock:
-        if _pool:
-            return _pool.pop()
-    return init_driver(proxy)
-
-
-def release_driver(driver: webdriver.Chrome) -> None:
-    with _lock:
-        if len(_pool) < MAX_DRIVERS:
-            _pool.append(driver)
-        else:
-            driver.quit()
+    return pool.checkout(proxy)
+
+
+def release_driver(driver: webdriver.Chrome, healthy: bool = True) -> None:
+    pool.checkin(driver, healthy)
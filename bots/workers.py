@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from bisect import bisect
+from dataclasses import asdict
+import hashlib
+import json
+import os
+from pathlib import Path
+import queue
+import socket
+import subprocess
+import sys
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Set
+
+from bots.supervisor import BotSpec, ExitCallback
+from shared.logger import logger
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+WORKER_SCRIPT = SCRIPTS_DIR / "bot_worker.py"
+ZYGOTE_SCRIPT = SCRIPTS_DIR / "bot_zygote.py"
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class WorkerError(RuntimeError):
+    """The worker process died or answered with an error."""
+
+
+class WorkerHandle:
+    """One control-socket process such as ``scripts/bot_worker.py``.
+
+    A reader thread splits the worker's output into responses, which go to
+    the pending :meth:`request`, and ``exit`` events, which go to
+    ``on_exit``. If the worker dies or stops answering it is killed, every
+    bot it hosted is reported as exited and the next request starts a new
+    one.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        script: Path = WORKER_SCRIPT,
+        timeout: float = 10.0,
+        on_exit: Optional[ExitCallback] = None,
+    ):
+        self.index = index
+        self.script = script
+        self.timeout = timeout
+        self.on_exit = on_exit
+        self.proc: Optional[subprocess.Popen] = None
+        # bots the current process has started and not yet reported exited
+        self.hosted: Set[int] = set()
+        self._sock: Optional[socket.socket] = None
+        self._responses: queue.Queue = queue.Queue()
+        self._pending: Optional[dict] = None
+        self._lock = Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc else None
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def spawn(self) -> None:
+        parent, child = socket.socketpair()
+        self.proc = subprocess.Popen(
+            [sys.executable, str(self.script), "--control-fd", str(child.fileno())],
+            pass_fds=(child.fileno(),),
+        )
+        child.close()
+        self._sock = parent
+        self._responses = queue.Queue()
+        self.hosted = set()
+        Thread(
+            target=self._read,
+            args=(self.proc, parent.makefile("rb"), self._responses),
+            name=f"{self.script.stem}-{self.index}",
+            daemon=True,
+        ).start()
+        logger.info("started %s %s pid=%s", self.script.stem, self.index, self.proc.pid)
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if not self.alive():
+                if self.proc is not None:
+                    self._abandon()
+                self.spawn()
+
+    def request(self, op: str, **payload) -> dict:
+        self.ensure_started()
+        message = {"op": op, **payload}
+        with self._lock:
+            self._pending = message
+            try:
+                self._sock.sendall(json.dumps(message).encode() + b"\n")
+                response = self._responses.get(timeout=self.timeout)
+            except OSError as exc:
+                self._abandon()
+                raise WorkerError(f"worker {self.index} unreachable: {exc}") from exc
+            except queue.Empty:
+                self._abandon()
+                raise WorkerError(f"worker {self.index} timed out") from None
+            if response is None:
+                self._abandon()
+                raise WorkerError(f"worker {self.index} exited")
+        if not response.get("ok"):
+            raise WorkerError(response.get("error", "worker error"))
+        return response
+
+    def _read(self, proc: subprocess.Popen, stream, responses: queue.Queue) -> None:
+        with stream:
+            try:
+                for line in stream:
+                    if self.proc is not proc:
+                        break
+                    message = json.loads(line)
+                    if message.get("event") == "exit":
+                        self._exited(message)
+                    else:
+                        self._track(self._pending, message)
+                        responses.put(message)
+            except (OSError, ValueError):
+                pass
+        responses.put(None)
+        with self._lock:
+            if self.proc is proc:
+                self._abandon()
+
+    def _track(self, request: Optional[dict], response: dict) -> None:
+        # runs on the reader thread, so it is ordered with exit events
+        if request and request["op"] == "add" and response.get("running"):
+            self.hosted.add(request["spec"]["bot_id"])
+
+    def _exited(self, event: dict) -> None:
+        self.hosted.discard(event["bot_id"])
+        if self.on_exit is not None:
+            self.on_exit(event["bot_id"], event["state"], event.get("error"))
+
+    def _abandon(self) -> None:
+        """Kill a dead or wedged worker so the next request spawns a new one."""
+        if self.alive():
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+        self.close()
+        lost, self.hosted = self.hosted, set()
+        if lost:
+            logger.warning("worker %s lost with %d bots", self.index, len(lost))
+        if self.on_exit is not None:
+            for bot_id in sorted(lost):
+                self.on_exit(bot_id, "error", f"worker {self.index} exited")
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                # wakes the reader thread, which closes its own file
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        self._sock = None
+
+    def shutdown(self) -> None:
+        if self.alive():
+            try:
+                self.request("shutdown")
+                self.proc.wait(timeout=self.timeout)
+            except WorkerError:
+                return  # already killed by _abandon
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        with self._lock:
+            # an orderly shutdown is not a lost worker
+            self.proc = None
+            self.hosted = set()
+            self.close()
+
+
+class WorkerPool:
+    """Fixed set of multi-bot worker processes.
+
+    Bots are assigned to workers with a consistent hash ring, so the process
+    count stays proportional to CPU cores rather than to the fleet size and
+    resizing the pool only moves a fraction of the bots.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        replicas: int = 64,
+        script: Path = WORKER_SCRIPT,
+        on_exit: Optional[ExitCallback] = None,
+    ):
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.on_exit = on_exit
+        self.handles: Dict[int, WorkerHandle] = {
+            idx: WorkerHandle(idx, script=script, on_exit=self._exited)
+            for idx in range(self.size)
+        }
+        self._ring = sorted(
+            (_hash(f"worker-{idx}-{rep}"), idx)
+            for idx in range(self.size)
+            for rep in range(replicas)
+        )
+        self._keys = [key for key, _ in self._ring]
+
+    def worker_for(self, bot_id: int) -> WorkerHandle:
+        pos = bisect(self._keys, _hash(f"bot-{bot_id}")) % len(self._ring)
+        return self.handles[self._ring[pos][1]]
+
+    def start(self, spec: BotSpec) -> tuple[dict, bool]:
+        handle = self.worker_for(spec.bot_id)
+        response = handle.request("add", spec=asdict(spec))
+        return {**response, "worker": handle.index}, response["started"]
+
+    def stop(self, bot_id: int) -> bool:
+        handle = self.worker_for(bot_id)
+        if not handle.alive():
+            return False
+        return handle.request("remove", bot_id=bot_id)["stopped"]
+
+    def is_running(self, bot_id: int) -> bool:
+        return self.status(bot_id)["running"]
+
+    def status(self, bot_id: int) -> dict:
+        handle = self.worker_for(bot_id)
+        if not handle.alive():
+            return {"running": False, "pid": None, "returncode": None}
+        response = handle.request("status", bot_id=bot_id)
+        response.pop("ok", None)
+        return {**response, "worker": handle.index}
+
+    def running_ids(self) -> List[int]:
+        ids: List[int] = []
+        for handle in self.handles.values():
+            if handle.alive():
+                try:
+                    ids.extend(handle.request("list")["bots"])
+                except WorkerError as exc:
+                    logger.warning("worker %s skipped: %s", handle.index, exc)
+        return ids
+
+    def __len__(self) -> int:
+        # kept up to date by start responses and exit events, so the
+        # bots_running gauge never waits on a worker
+        return sum(len(handle.hosted) for handle in self.handles.values())
+
+    def warm(self) -> None:
+        for handle in self.handles.values():
+            handle.ensure_started()
+
+    def shutdown(self) -> None:
+        for handle in self.handles.values():
+            handle.shutdown()
+
+    def _exited(self, bot_id: int, state: str, error: Optional[str]) -> None:
+        # ``on_exit`` is assigned after construction by ``watch_exits``
+        if self.on_exit is not None:
+            self.on_exit(bot_id, state, error)
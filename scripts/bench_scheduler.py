@@ -0,0 +1,136 @@
+"""Compare bot tick dispatch on APScheduler and the timing wheel.
+
+Example::
+
+    python scripts/bench_scheduler.py --bots 1000 10000 50000 --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from backend.timing_wheel import TimingWheel
+
+
+class Recorder:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lateness: list[float] = []
+        self._lock = threading.Lock()
+
+    def hit(self, first: float) -> None:
+        now = time.time()
+        k = max(0, round((now - first) / self.interval))
+        late = now - (first + k * self.interval)
+        with self._lock:
+            self.lateness.append(late)
+
+
+def bench_apscheduler(bots: int, interval: float, duration: float, workers: int):
+    recorder = Recorder(interval)
+    sched = BackgroundScheduler(
+        executors={"default": ThreadPoolExecutor(max_workers=workers)},
+        job_defaults={"max_instances": workers},
+    )
+    cpu = time.process_time()
+    setup = time.perf_counter()
+    base = time.time() + 1.0
+    for idx in range(bots):
+        first = base + random.uniform(0, interval)
+        sched.add_job(
+            recorder.hit,
+            "interval",
+            seconds=interval,
+            start_date=datetime.fromtimestamp(first),
+            args=(first,),
+            id=str(idx),
+        )
+    sched.start()
+    setup = time.perf_counter() - setup
+    time.sleep(max(0.0, base - time.time()) + duration)
+    sched.shutdown(wait=False)
+    return setup, time.process_time() - cpu, recorder.lateness
+
+
+def bench_wheel(bots: int, interval: float, duration: float, tick: float):
+    recorder = Recorder(interval)
+    wheel = TimingWheel(tick=tick)
+    cpu = time.process_time()
+    setup = time.perf_counter()
+    for idx in range(bots):
+        delay = 1.0 + random.uniform(0, interval)
+        first = time.time() + delay
+        wheel.schedule(idx, interval, lambda f=first: recorder.hit(f), delay=delay)
+    setup = time.perf_counter() - setup
+
+    async def run():
+        task = asyncio.ensure_future(wheel.run())
+        await asyncio.sleep(1.0 + duration)
+        task.cancel()
+
+    asyncio.run(run())
+    return setup, time.process_time() - cpu, recorder.lateness
+
+
+def _report(name: str, bots: int, setup: float, cpu: float, lateness: list[float]):
+    if lateness:
+        ordered = sorted(lateness)
+        p50 = statistics.median(ordered) * 1000
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    else:
+        p50 = p99 = float("nan")
+    print(
+        f"{name:<12} bots={bots:<6} dispatched={len(lateness):<8} "
+        f"setup={setup:.2f}s cpu={cpu:.2f}s p50={p50:.1f}ms p99={p99:.1f}ms",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot tick scheduler benchmark")
+    parser.add_argument("--bots", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--tick", type=float, default=0.1)
+    parser.add_argument(
+        "--backend",
+        choices=("both", "apscheduler", "wheel"),
+        default="both",
+    )
+    args = parser.parse_args()
+    logging.getLogger("apscheduler").setLevel(logging.ERROR)
+
+    for bots in args.bots:
+        if args.backend in {"both", "apscheduler"}:
+            _report(
+                "apscheduler",
+                bots,
+                *bench_apscheduler(bots, args.interval, args.duration, args.workers),
+            )
+        if args.backend in {"both", "wheel"}:
+            _report(
+                "wheel",
+                bots,
+                *bench_wheel(bots, args.interval, args.duration, args.tick),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import importlib.util
 import os
 import time
 from typing import Any
+import weakref
 
+import httpx
 import requests
 
 from shared.local_kick_mock import record_event
@@ -14,6 +20,9 @@ DEFAULT_CHAT_API_URL = "https://api.kick.com/public/v1/chat"
 DEFAULT_TIMEOUT_SECONDS = 15
 DEFAULT_LOCAL_SESSION_TTL_SECONDS = 300
 DEFAULT_LOCAL_MIN_INTERVAL_SECONDS = 2
+DEFAULT_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_HTTP_MAX_KEEPALIVE = 20
+DEFAULT_HTTP_MAX_IN_FLIGHT = 50
 
 
 class BotTransportError(RuntimeError):
@@ -37,6 +46,65 @@ class BotRateLimited(BotTransportError):
         self.retry_after = retry_after
 
 
+def retry_after_seconds(value: str | None, default: float) -> float:
+    """Parse a Retry-After header given as seconds or as an HTTP date."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpPool:
+    """Keep-alive HTTP client shared by every live bot on one event loop.
+
+    HTTP/2 is negotiated when the optional ``h2`` package is installed, and
+    in-flight requests are capped by ``KICK_HTTP_MAX_IN_FLIGHT``.
+    """
+
+    _pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HttpPool]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=int(
+                    os.getenv("KICK_HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS)
+                ),
+                max_keepalive_connections=int(
+                    os.getenv("KICK_HTTP_MAX_KEEPALIVE", DEFAULT_HTTP_MAX_KEEPALIVE)
+                ),
+            ),
+        )
+        self.in_flight = asyncio.Semaphore(
+            int(os.getenv("KICK_HTTP_MAX_IN_FLIGHT", DEFAULT_HTTP_MAX_IN_FLIGHT))
+        )
+
+    @classmethod
+    def current(cls) -> "HttpPool":
+        loop = asyncio.get_running_loop()
+        pool = cls._pools.get(loop)
+        if pool is None:
+            pool = cls._pools[loop] = cls()
+        return pool
+
+    @classmethod
+    async def close(cls) -> None:
+        pool = cls._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.client.aclose()
+
+
 @dataclass(frozen=True)
 class BotActionResult:
     ok: bool
@@ -55,6 +123,9 @@ class BaseBotTransport:
     def send_message(self, channel: str, message: str) -> BotActionResult:
         raise NotImplementedError
 
+    async def send_message_async(self, channel: str, message: str) -> BotActionResult:
+        return await asyncio.to_thread(self.send_message, channel, message)
+
     def follow_channel(self, channel: str) -> BotActionResult:
         return BotActionResult(
             ok=False,
@@ -210,28 +281,23 @@ class LiveKickBot(BaseBotTransport):
             payload["broadcaster_user_id"] = int(channel)
         return payload
 
-    def send_message(self, channel: str, message: str) -> BotActionResult:
-        headers = {
+    def _headers(self) -> dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
-        response = self.session.post(
-            self.api_url,
-            json=self._payload(channel, message),
-            headers=headers,
-            timeout=self.timeout_seconds,
-        )
-        if response.status_code == 401:
+
+    def _result(self, channel: str, status_code: int, headers, data) -> BotActionResult:
+        if status_code == 401:
             raise BotUnauthorized("unauthorized")
-        if response.status_code == 403:
+        if status_code == 403:
             raise BotForbidden("forbidden_missing_scope_or_bot_access")
-        if response.status_code == 429:
-            raise BotRateLimited(response.headers.get("Retry-After"))
-        if response.status_code >= 400:
-            raise BotTransportError(f"http_status={response.status_code}")
+        if status_code == 429:
+            raise BotRateLimited(headers.get("Retry-After"))
+        if status_code >= 400:
+            raise BotTransportError(f"http_status={status_code}")
 
-        data = _safe_json(response)
         message_id = None
         if isinstance(data.get("data"), dict):
             message_id = data["data"].get("message_id")
@@ -245,8 +311,35 @@ class LiveKickBot(BaseBotTransport):
             detail="sent",
         )
 
+    def send_message(self, channel: str, message: str) -> BotActionResult:
+        response = self.session.post(
+            self.api_url,
+            json=self._payload(channel, message),
+            headers=self._headers(),
+            timeout=self.timeout_seconds,
+        )
+        return self._result(
+            channel, response.status_code, response.headers, _safe_json(response)
+        )
+
+    async def send_message_async(self, channel: str, message: str) -> BotActionResult:
+        pool = HttpPool.current()
+        async with pool.in_flight:
+            try:
+                response = await pool.client.post(
+                    self.api_url,
+                    json=self._payload(channel, message),
+                    headers=self._headers(),
+                    timeout=self.timeout_seconds,
+                )
+            except httpx.HTTPError as exc:
+                raise BotTransportError(f"http_error={type(exc).__name__}") from exc
+        return self._result(
+            channel, response.status_code, response.headers, _safe_json(response)
+        )
+
 
-def _safe_json(response: requests.Response) -> dict[str, Any]:
+def _safe_json(response: requests.Response | httpx.Response) -> dict[str, Any]:
     try:
         data = response.json()
     except ValueError:
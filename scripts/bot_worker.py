@@ -0,0 +1,107 @@
+"""Host many bots' send loops in one process.
+
+The dashboard starts one worker per CPU and talks to it over an inherited
+socket using newline-delimited JSON requests::
+
+    {"op": "add", "spec": {...}}     -> {"ok": true, "started": true, ...}
+    {"op": "remove", "bot_id": 1}    -> {"ok": true, "stopped": true}
+    {"op": "status", "bot_id": 1}    -> {"ok": true, "running": true, ...}
+    {"op": "list"}                   -> {"ok": true, "bots": [1, 2]}
+    {"op": "shutdown"}               -> {"ok": true}
+
+When a bot's send loop ends for any reason the worker also writes an
+unsolicited ``{"event": "exit", "bot_id": 1, "state": "error", "error": "..."}``
+line, so the dashboard can report crashes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bots.supervisor import BotSpec, BotSupervisor
+from scripts.bot_transports import HttpPool
+
+
+def handle(supervisor: BotSupervisor, request: dict) -> dict:
+    op = request.get("op")
+    if op == "add":
+        spec = BotSpec(**request["spec"])
+        _, started = supervisor.start(spec)
+        return {"ok": True, "started": started, **supervisor.status(spec.bot_id)}
+    if op == "remove":
+        return {"ok": True, "stopped": supervisor.stop(int(request["bot_id"]))}
+    if op == "status":
+        return {"ok": True, **supervisor.status(int(request["bot_id"]))}
+    if op == "list":
+        return {"ok": True, "bots": supervisor.running_ids()}
+    if op == "ping":
+        return {"ok": True, "running": len(supervisor)}
+    return {"ok": False, "error": f"unknown op: {op}"}
+
+
+def exit_event(bot_id: int, state: str, error: str | None) -> bytes:
+    event = {"event": "exit", "bot_id": bot_id, "state": state, "error": error}
+    return json.dumps(event).encode() + b"\n"
+
+
+async def serve(control: socket.socket) -> None:
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection(sock=control)
+
+    def send(line: bytes) -> None:
+        if not writer.is_closing():
+            writer.write(line)
+
+    def exited(bot_id: int, state: str, error: str | None) -> None:
+        loop.call_soon_threadsafe(send, exit_event(bot_id, state, error))
+
+    supervisor = BotSupervisor(loop, on_exit=exited)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"ok": False, "error": "invalid json"}
+            else:
+                if request.get("op") == "shutdown":
+                    writer.write(b'{"ok": true}\n')
+                    await writer.drain()
+                    break
+                try:
+                    response = handle(supervisor, request)
+                except (KeyError, TypeError, ValueError) as exc:
+                    response = {"ok": False, "error": str(exc)}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+    finally:
+        supervisor.stop_all()
+        await asyncio.sleep(0)
+        await HttpPool.close()
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BetterKickBot multi-bot worker")
+    parser.add_argument("--control-fd", type=int, required=True)
+    args = parser.parse_args()
+    control = socket.socket(fileno=args.control_fd)
+    try:
+        asyncio.run(serve(control))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Warm fork server for bot processes.
+
+The zygote imports the transports, ``requests`` and ``shared.*`` once and
+then forks a child per bot, so starting a bot skips interpreter start-up
+and imports. It is driven over an inherited socket with the same
+newline-delimited JSON protocol as ``bot_worker.py``::
+
+    {"op": "add", "spec": {...}}     -> {"ok": true, "started": true, "pid": 42}
+    {"op": "remove", "bot_id": 1}    -> {"ok": true, "stopped": true}
+    {"op": "status", "bot_id": 1}    -> {"ok": true, "running": true, ...}
+    {"op": "list"}                   -> {"ok": true, "bots": [1, 2]}
+    {"op": "shutdown"}               -> {"ok": true}
+
+Children that exit are reported with the same unsolicited ``exit`` event
+lines as the worker sends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import select
+import signal
+import socket
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import requests  # noqa: F401  imported so forked bots inherit it warm
+
+import scripts.bot_transports  # noqa: F401
+from bots.supervisor import BotSpec
+from scripts.run_bot import make_logger, send_loop
+
+children: dict[int, int] = {}
+returncodes: dict[int, int] = {}
+# bots sent SIGTERM by "remove", whose exit is a stop rather than a crash
+stopping: set[int] = set()
+
+
+def exit_event(bot_id: int, code: int) -> bytes:
+    if code == 0 or bot_id in stopping:
+        state, error = "stopped", None
+    else:
+        state, error = "error", f"exit code {code}"
+    stopping.discard(bot_id)
+    event = {"event": "exit", "bot_id": bot_id, "state": state, "error": error}
+    return json.dumps(event).encode() + b"\n"
+
+
+def reap() -> list[bytes]:
+    """Collect exited children and return their exit events."""
+    events = []
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return events
+        if pid == 0:
+            return events
+        code = os.waitstatus_to_exitcode(status)
+        for bot_id, child in list(children.items()):
+            if child == pid:
+                del children[bot_id]
+                returncodes[bot_id] = code
+                events.append(exit_event(bot_id, code))
+                break
+
+
+def run_child(spec: BotSpec, fds: tuple[int, ...]) -> None:
+    # never return into the zygote's serve loop, whatever happens here
+    code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        for fd in fds:
+            os.close(fd)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.environ["KICK_BOT_ID"] = str(spec.bot_id)
+        log = make_logger(spec.bot_id, spec.log_dir)
+        log(f"stage=start mode={spec.test_mode} runner=prefork")
+        asyncio.run(
+            send_loop(
+                spec.channel,
+                spec.message,
+                spec.interval,
+                spec.token,
+                spec.test_mode,
+                log,
+                actor=f"bot-{spec.bot_id}",
+                local_store_path=spec.store_path,
+            )
+        )
+        code = 0
+    finally:
+        os._exit(code)
+
+
+def status(bot_id: int) -> dict:
+    pid = children.get(bot_id)
+    return {
+        "running": pid is not None,
+        "pid": pid,
+        "returncode": None if pid else returncodes.get(bot_id),
+    }
+
+
+def handle(request: dict, fds: tuple[int, ...]) -> dict:
+    op = request.get("op")
+    if op == "add":
+        spec = BotSpec(**request["spec"])
+        if spec.bot_id in children:
+            return {"ok": True, "started": False, **status(spec.bot_id)}
+        pid = os.fork()
+        if pid == 0:
+            run_child(spec, fds)
+        returncodes.pop(spec.bot_id, None)
+        children[spec.bot_id] = pid
+        return {"ok": True, "started": True, **status(spec.bot_id), "pid": pid}
+    if op == "remove":
+        bot_id = int(request["bot_id"])
+        pid = children.get(bot_id)
+        if pid is None:
+            return {"ok": True, "stopped": False}
+        stopping.add(bot_id)
+        os.kill(pid, signal.SIGTERM)
+        return {"ok": True, "stopped": True}
+    if op == "status":
+        return {"ok": True, **status(int(request["bot_id"]))}
+    if op == "list":
+        return {"ok": True, "bots": sorted(children)}
+    if op == "ping":
+        return {"ok": True, "running": len(children)}
+    return {"ok": False, "error": f"unknown op: {op}"}
+
+
+def serve(control: socket.socket) -> None:
+    # SIGCHLD only wakes the select below; children are reaped in this loop
+    # so exit events never interleave with a half-written response
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.signal(signal.SIGCHLD, lambda *_args: None)
+    signal.set_wakeup_fd(wake_w)
+    fds = (control.fileno(), wake_r, wake_w)
+    pending = b""
+    try:
+        while True:
+            ready, _, _ = select.select([control, wake_r], [], [])
+            if wake_r in ready:
+                while True:
+                    try:
+                        os.read(wake_r, 4096)
+                    except BlockingIOError:
+                        break
+            lines: list[bytes] = []
+            if control in ready:
+                data = control.recv(65536)
+                if not data:
+                    break
+                *lines, pending = (pending + data).split(b"\n")
+            out = reap()
+            for line in filter(None, lines):
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "invalid json"}
+                else:
+                    if request.get("op") == "shutdown":
+                        control.sendall(b"".join(out) + b'{"ok": true}\n')
+                        return
+                    try:
+                        response = handle(request, fds)
+                    except (KeyError, TypeError, ValueError, OSError) as exc:
+                        response = {"ok": False, "error": str(exc)}
+                out.append(json.dumps(response).encode() + b"\n")
+            if out:
+                control.sendall(b"".join(out))
+    finally:
+        for pid in list(children.values()):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BetterKickBot warm fork server")
+    parser.add_argument("--control-fd", type=int, required=True)
+    args = parser.parse_args()
+    serve(socket.socket(fileno=args.control_fd))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,13 @@ if str(PROJECT_ROOT) not in sys.path:
 from scripts.bot_transports import (
     BotRateLimited,
     BotTransportError,
+    HttpPool,
     create_transport,
     resolve_transport_mode,
+    retry_after_seconds,
 )
 from shared.kick_tokens import token_info
+from shared.rate_limit import limiter
 
 TOKEN_ENV = "KICK_BOT_TOKEN"
 LogFn = Callable[[str], None]
@@ -65,11 +68,15 @@ async def send_loop(
     token: str,
     requested_mode: str,
     log: LogFn,
+    actor: str | None = None,
+    local_store_path: str | None = None,
 ):
     mode = resolve_transport_mode(token, requested_mode)
     info = token_info(token)
-    actor = f"bot-{os.getenv('KICK_BOT_ID', 'local')}"
-    transport = create_transport(token, requested_mode, actor=actor)
+    actor = actor or f"bot-{os.getenv('KICK_BOT_ID', 'local')}"
+    transport = create_transport(
+        token, requested_mode, actor=actor, local_store_path=local_store_path
+    )
     delay = max(1, interval)
 
     log(f"stage=token_detected kind={info.kind} transport={transport.name}")
@@ -77,11 +84,15 @@ async def send_loop(
 
     while True:
         try:
+            if not transport.simulated:
+                waited = await limiter.acquire(token, channel)
+                if waited:
+                    log(f"stage=paced wait={waited:.2f}")
             log(
                 f"stage=send_attempt action=send_message "
                 f"transport={transport.name} channel={channel}"
             )
-            result = transport.send_message(channel, message)
+            result = await transport.send_message_async(channel, message)
             log(format_result(result))
         except BotRateLimited as exc:
             retry_after = exc.retry_after or delay
@@ -89,11 +100,12 @@ async def send_loop(
                 "stage=send_error reason=rate_limited "
                 f"transport={transport.name} retry_after={retry_after}"
             )
-            try:
-                retry_delay = int(retry_after)
-            except (TypeError, ValueError):
-                retry_delay = delay
-            await asyncio.sleep(max(1, retry_delay))
+            retry_delay = max(1.0, retry_after_seconds(exc.retry_after, delay))
+            if transport.simulated:
+                await asyncio.sleep(retry_delay)
+            else:
+                # the shared limiter holds back every bot on this token
+                limiter.penalize(token, retry_delay)
             continue
         except BotTransportError as exc:
             log(f"stage=send_error reason={exc} transport={transport.name}")
@@ -132,9 +144,9 @@ def main():
     mode = resolve_transport_mode(token, args.test_mode)
     log(f"stage=start mode={mode}")
 
-    try:
-        asyncio.run(
-            send_loop(
+    async def run() -> None:
+        try:
+            await send_loop(
                 args.channel,
                 args.message,
                 args.interval,
@@ -142,7 +154,11 @@ def main():
                 args.test_mode,
                 log,
             )
-        )
+        finally:
+            await HttpPool.close()
+
+    try:
+        asyncio.run(run())
     except KeyboardInterrupt:
         log("stage=stopped reason=keyboard_interrupt")
 
@@ -1,21 +1,232 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from flask_caching import Cache
+from flask_caching.backends.base import BaseCache
+from flask_caching.backends.rediscache import RedisCache
+import hashlib
+import json
 import os
+from threading import Event, Lock, Thread
+import time
+from typing import Any, Callable, Mapping, Optional
+from uuid import uuid4
 from flask import Flask
+from redis.exceptions import RedisError
+
+from shared.logger import logger
 
 cache = Cache()
 
+LOCK_STRIPES = 64
+_locks = [Lock() for _ in range(LOCK_STRIPES)]
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+LISTEN_RETRY_MAX = 30.0
+
+
+@dataclass
+class TierStats:
+    local_hits: int = 0
+    local_misses: int = 0
+    remote_hits: int = 0
+    remote_misses: int = 0
+    invalidations: int = 0
+
+
+stats = TierStats()
+
+
+class TieredCache(BaseCache):
+    """Small in-process LRU in front of Redis.
+
+    Reads are served locally for at most ``local_ttl`` seconds. Every write
+    publishes the key on ``INVALIDATION_CHANNEL`` so other processes drop
+    their local copy. The subscriber thread starts on first use and keeps
+    reconnecting while Redis is down. Local values are shared objects, not
+    copies, and must not be mutated by callers.
+    """
+
+    def __init__(
+        self,
+        remote: RedisCache,
+        default_timeout: int = 300,
+        local_size: int = 1024,
+        local_ttl: float = 5.0,
+        channel: str = INVALIDATION_CHANNEL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(default_timeout)
+        self.remote = remote
+        self.local_size = local_size
+        self.local_ttl = local_ttl
+        self.channel = channel
+        self.clock = clock
+        self.node = uuid4().hex
+        self._local: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._listener: Optional[Thread] = None
+        self._stopped = Event()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        remote = RedisCache.factory(app, config, args, dict(kwargs))
+        return cls(
+            remote,
+            default_timeout=config["CACHE_DEFAULT_TIMEOUT"],
+            local_size=int(config.get("CACHE_LOCAL_SIZE", 1024)),
+            local_ttl=float(config.get("CACHE_LOCAL_TTL", 5)),
+        )
+
+    def listen(self) -> None:
+        """Start the invalidation subscriber if it is not running yet."""
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is None:
+                self._stopped.clear()
+                self._listener = Thread(
+                    target=self._listen, name="cache-invalidation", daemon=True
+                )
+                self._listener.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.join(timeout=5)
+
+    def _listen(self) -> None:
+        attempt = 0
+        while not self._stopped.is_set():
+            pubsub = self.remote._read_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                attempt = 0
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._on_message(message)
+            except RedisError as exc:
+                # writes published while we were disconnected are lost
+                self._forget("*")
+                delay = min(LISTEN_RETRY_MAX, 2**attempt)
+                attempt += 1
+                logger.warning(
+                    "cache invalidation subscriber failed: %s; retrying in %ss",
+                    exc,
+                    delay,
+                )
+                self._stopped.wait(delay)
+            finally:
+                pubsub.close()
+
+    def _on_message(self, message: dict) -> None:
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if data.get("node") == self.node:
+            return
+        stats.invalidations += 1
+        self._forget(*data["keys"])
+
+    def _publish(self, *keys: str) -> None:
+        message = json.dumps({"node": self.node, "keys": list(keys)})
+        try:
+            self.remote._write_client.publish(self.channel, message)
+        except Exception as exc:  # noqa: broad-except
+            logger.warning("cache invalidation publish failed: %s", exc)
+
+    def _forget(self, *keys: str) -> None:
+        with self._lock:
+            if "*" in keys:
+                self._local.clear()
+            for key in keys:
+                self._local.pop(key, None)
+
+    def _remember(self, key: str, value: Any, timeout: Optional[int]) -> None:
+        timeout = self._normalize_timeout(timeout)
+        ttl = min(self.local_ttl, timeout) if timeout else self.local_ttl
+        with self._lock:
+            self._local[key] = (self.clock() + ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _changed(self, *keys: str) -> None:
+        self._forget(*keys)
+        self._publish(*keys)
+
+    def get(self, key: str) -> Any:
+        self.listen()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._local.move_to_end(key)
+                stats.local_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._local[key]
+        stats.local_misses += 1
+        value = self.remote.get(key)
+        if value is None:
+            stats.remote_misses += 1
+            return None
+        stats.remote_hits += 1
+        self._remember(key, value, None)
+        return value
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        self.listen()
+        result = self.remote.set(key, value, timeout)
+        self._changed(key)
+        self._remember(key, value, timeout)
+        return result
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        added = self.remote.add(key, value, timeout)
+        if added:
+            self._changed(key)
+        return added
+
+    def delete(self, key: str) -> bool:
+        result = self.remote.delete(key)
+        self._changed(key)
+        return result
+
+    def has(self, key: str) -> bool:
+        return self.remote.has(key)
+
+    def inc(self, key: str, delta: int = 1) -> Optional[int]:
+        value = self.remote.inc(key, delta)
+        self._changed(key)
+        return value
+
+    def dec(self, key: str, delta: int = 1) -> Optional[int]:
+        value = self.remote.dec(key, delta)
+        self._changed(key)
+        return value
+
+    def clear(self) -> bool:
+        result = self.remote.clear()
+        self._changed("*")
+        return result
+
 
 def init_cache(app: Flask | None = None) -> None:
     """Initialize Flask-Caching.
 
-    Uses Redis when ``REDIS_URL`` is defined, otherwise falls back to
+    Uses Redis behind a per-process LRU (:class:`TieredCache`) when
+    ``REDIS_URL`` is defined, otherwise falls back to
     ``SimpleCache`` so the application can run without Redis.
     """
     redis_url = os.getenv("REDIS_URL")
     if redis_url:
         config = {
-            "CACHE_TYPE": "RedisCache",
+            "CACHE_TYPE": "shared.cache.TieredCache",
             "CACHE_REDIS_URL": redis_url,
+            "CACHE_LOCAL_SIZE": int(os.getenv("CACHE_LOCAL_SIZE", "1024")),
+            "CACHE_LOCAL_TTL": float(os.getenv("CACHE_LOCAL_TTL", "5")),
         }
     else:
         config = {"CACHE_TYPE": "SimpleCache"}
@@ -31,3 +242,58 @@ def init_cache(app: Flask | None = None) -> None:
 
 
 init_cache()
+
+
+def cache_version(namespace: str) -> int:
+    version = cache.get(f"version:{namespace}")
+    return int(version) if version is not None else 0
+
+
+def bump_version(*namespaces: str) -> None:
+    """Invalidate every key built by :func:`versioned_key` for ``namespaces``."""
+    for namespace in namespaces:
+        key = f"version:{namespace}"
+        if cache.cache.inc(key) is None:
+            cache.set(key, 1, timeout=0)
+
+
+def versioned_key(namespace: str, params: Mapping[str, Any]) -> str:
+    digest = hashlib.sha1(
+        json.dumps(sorted(params.items()), default=str).encode()
+    ).hexdigest()
+    return f"{namespace}:v{cache_version(namespace)}:{digest}"
+
+
+def get_or_set(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: int = 60,
+    lock_timeout: float = 10.0,
+) -> Any:
+    """Return ``key`` from the cache, computing it once on a miss.
+
+    Threads in this process queue on a striped lock; other processes see
+    the ``lock:`` marker added with ``cache.add`` and wait for the value
+    instead of recomputing it.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    with _locks[hash(key) % LOCK_STRIPES]:
+        value = cache.get(key)
+        if value is not None:
+            return value
+        lock_key = f"lock:{key}"
+        if not cache.add(lock_key, 1, timeout=int(lock_timeout)):
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = cache.get(key)
+                if value is not None:
+                    return value
+        try:
+            value = compute()
+            cache.set(key, value, timeout=timeout)
+        finally:
+            cache.delete(lock_key)
+    return value
@@ -19,6 +19,37 @@ class Config:
     SLACK_WEBHOOK: str | None = os.getenv("SLACK_WEBHOOK")
     TELEGRAM_TOKEN: str | None = os.getenv("TELEGRAM_TOKEN")
     TELEGRAM_CHAT_ID: str | None = os.getenv("TELEGRAM_CHAT_ID")
+    BOT_RUNNER: str = os.getenv("BOT_RUNNER", "inprocess")
+    WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", "0"))
+    LOGIN_WORKERS: int = int(os.getenv("LOGIN_WORKERS", "4"))
+    SCHEDULER_BACKEND: str = os.getenv("SCHEDULER_BACKEND", "apscheduler")
+    WHEEL_TICK_SECONDS: float = float(os.getenv("WHEEL_TICK_SECONDS", "0.1"))
+    SCHEDULER_MODE: str = os.getenv("SCHEDULER_MODE", "account")
+    SCHEDULER_BATCH_SIZE: int = int(os.getenv("SCHEDULER_BATCH_SIZE", "100"))
+    SCHEDULER_JITTER_SECONDS: float = float(os.getenv("SCHEDULER_JITTER_SECONDS", "0"))
+    SCHEDULER_CONCURRENCY: int = int(os.getenv("SCHEDULER_CONCURRENCY", "20"))
+    MESSAGE_CACHE_SIZE: int = int(os.getenv("MESSAGE_CACHE_SIZE", "256"))
+    RATE_LIMIT_FILE: str = os.getenv("RATE_LIMIT_FILE", "logs/rate_limits.json")
+    SEND_RATE_PER_TOKEN: float = float(os.getenv("SEND_RATE_PER_TOKEN", "1"))
+    SEND_BURST_PER_TOKEN: int = int(os.getenv("SEND_BURST_PER_TOKEN", "3"))
+    SEND_RATE_PER_CHANNEL: float = float(os.getenv("SEND_RATE_PER_CHANNEL", "5"))
+    SEND_BURST_PER_CHANNEL: int = int(os.getenv("SEND_BURST_PER_CHANNEL", "10"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    SCHEDULER_DB_POOL_SIZE: int = int(os.getenv("SCHEDULER_DB_POOL_SIZE", "5"))
+    SCHEDULER_DB_MAX_OVERFLOW: int = int(os.getenv("SCHEDULER_DB_MAX_OVERFLOW", "5"))
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    LOG_BATCH_ROWS: int = int(os.getenv("LOG_BATCH_ROWS", "500"))
+    LOG_FLUSH_MS: int = int(os.getenv("LOG_FLUSH_MS", "500"))
+    LOG_BUFFER_CAPACITY: int = int(os.getenv("LOG_BUFFER_CAPACITY", "10000"))
 
 
 def load_config() -> Config:
@@ -49,25 +49,34 @@ def mask_token(token: str | None) -> str:
     return f"{text[:6]}...{text[-4:]}"
 
 
-def token_info(token: str | None) -> TokenInfo:
+TOKEN_MODES = {
+    "empty": "invalid",
+    "cookie": "local_cookie_test",
+    "api": "live_kick",
+}
+TOKEN_MESSAGES = {
+    "empty": "Brak tokenu.",
+    "cookie": "Token wyglada jak cookie sesji Kick; test jest tylko lokalny.",
+    "api": "Token nie wyglada jak cookie; bot moze uzyc transportu live_kick.",
+}
+
+
+def token_kind(token: str | None) -> str:
     text = normalize_token(token)
     if not text:
-        return TokenInfo(
-            kind="empty",
-            mode="invalid",
-            mask="",
-            message="Brak tokenu.",
-        )
-    if looks_like_cookie_token(text):
-        return TokenInfo(
-            kind="cookie",
-            mode="local_cookie_test",
-            mask=mask_token(text),
-            message="Token wyglada jak cookie sesji Kick; test jest tylko lokalny.",
-        )
+        return "empty"
+    return "cookie" if looks_like_cookie_token(text) else "api"
+
+
+def stored_token_info(kind: str, mask: str) -> TokenInfo:
+    """Rebuild :class:`TokenInfo` from a stored kind and mask."""
     return TokenInfo(
-        kind="api",
-        mode="live_kick",
-        mask=mask_token(text),
-        message="Token nie wyglada jak cookie; bot moze uzyc transportu live_kick.",
+        kind=kind,
+        mode=TOKEN_MODES[kind],
+        mask=mask,
+        message=TOKEN_MESSAGES[kind],
     )
+
+
+def token_info(token: str | None) -> TokenInfo:
+    return stored_token_info(token_kind(token), mask_token(token))
@@ -7,6 +7,7 @@ from pathlib import Path
 import random
 import tempfile
 import time
+from typing import Iterable
 from uuid import uuid4
 
 from shared.social_platform import PlatformActionResult, SocialPlatformAdapter
@@ -160,17 +161,7 @@ class LocalKickMockAdapter(SocialPlatformAdapter):
         ttl = int(session_ttl_seconds or settings["session_ttl_seconds"])
         now = self.now_func()
         account_id = str(account_id or uuid4())
-        account = {
-            "id": account_id,
-            "username": username,
-            "status": status,
-            "session_token": str(uuid4()) if status != NO_SESSION else None,
-            "session_expires_at": now + ttl if status != NO_SESSION else None,
-            "created_at": utc_now(),
-            "updated_at": utc_now(),
-            "rate_timestamps": [],
-            "history": [],
-        }
+        account = _new_account(account_id, username, status, now + ttl)
         state["accounts"][account_id] = account
         self.store.save(state)
         return _public_account(account)
@@ -182,6 +173,23 @@ class LocalKickMockAdapter(SocialPlatformAdapter):
         self.store.save(state)
         return self.create_account(username, account_id=account_id)
 
+    def ensure_accounts(self, accounts: Iterable[tuple[str, str]]) -> None:
+        state = self.store.load()
+        settings = state["settings"]
+        created = False
+        for account_id, username in accounts:
+            if str(account_id) in state["accounts"]:
+                continue
+            state["accounts"][str(account_id)] = _new_account(
+                str(account_id),
+                username,
+                ACTIVE,
+                self.now_func() + int(settings["session_ttl_seconds"]),
+            )
+            created = True
+        if created:
+            self.store.save(state)
+
     def update_account(
         self,
         account_id: str,
@@ -255,6 +263,30 @@ class LocalKickMockAdapter(SocialPlatformAdapter):
     def unfollow_channel(self, account_id: str, channel: str) -> PlatformActionResult:
         return self._execute(account_id, "unfollow_channel", channel)
 
+    def send_many(
+        self, items: Iterable[tuple[str, str, str]]
+    ) -> list[PlatformActionResult]:
+        state = self.store.load()
+        results = [
+            self._execute_in_state(
+                state, str(account_id), "send_message", channel, content=message
+            )
+            for account_id, channel, message in items
+        ]
+        self.store.save(state)
+        return results
+
+    def follow_many(
+        self, items: Iterable[tuple[str, str]]
+    ) -> list[PlatformActionResult]:
+        state = self.store.load()
+        results = [
+            self._execute_in_state(state, str(account_id), "follow_channel", channel)
+            for account_id, channel in items
+        ]
+        self.store.save(state)
+        return results
+
     def enqueue_action(
         self,
         *,
@@ -691,6 +723,22 @@ class LocalKickMockAdapter(SocialPlatformAdapter):
         )
 
 
+def _new_account(
+    account_id: str, username: str, status: str, expires_at: float
+) -> dict:
+    return {
+        "id": account_id,
+        "username": username,
+        "status": status,
+        "session_token": str(uuid4()) if status != NO_SESSION else None,
+        "session_expires_at": expires_at if status != NO_SESSION else None,
+        "created_at": utc_now(),
+        "updated_at": utc_now(),
+        "rate_timestamps": [],
+        "history": [],
+    }
+
+
 def _record_rate_usage(state: dict, account: dict, now: float) -> None:
     account.setdefault("rate_timestamps", []).append(now)
     state.setdefault("global_rate_timestamps", []).append(now)
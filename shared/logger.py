@@ -1,6 +1,11 @@
+import atexit
+from collections import OrderedDict
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+import queue
+from threading import Lock
+from typing import Callable, Optional, TextIO
 
 import requests
 import sentry_sdk
@@ -28,6 +33,77 @@ def get_bot_logger(bot_id: int) -> logging.Logger:
     return bot_logger
 
 
+class BotFileHandler(logging.Handler):
+    """Append records to the per-bot file named by their ``log_path``.
+
+    The most recently used files are kept open so busy bots do not reopen
+    their log on every line.
+    """
+
+    def __init__(self, max_open: int = 64):
+        super().__init__()
+        self.max_open = max_open
+        self.setFormatter(
+            logging.Formatter("%(asctime)s %(message)s", "%Y-%m-%d %H:%M:%S")
+        )
+        self._streams: "OrderedDict[str, TextIO]" = OrderedDict()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            stream = self._stream(record.log_path)
+            stream.write(self.format(record) + "\n")
+            stream.flush()
+        except Exception:  # noqa: broad-except
+            self.handleError(record)
+
+    def _stream(self, path: str) -> TextIO:
+        stream = self._streams.pop(path, None)
+        if stream is None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            stream = open(path, "a", encoding="utf-8")
+            if len(self._streams) >= self.max_open:
+                self._streams.popitem(last=False)[1].close()
+        self._streams[path] = stream
+        return stream
+
+    def close(self) -> None:
+        for stream in self._streams.values():
+            stream.close()
+        self._streams.clear()
+        super().close()
+
+
+bot_lines = logging.getLogger("kickbot.bots")
+bot_lines.propagate = False
+bot_lines.setLevel(logging.INFO)
+_bot_listener: Optional[QueueListener] = None
+_bot_listener_lock = Lock()
+
+
+def _start_bot_listener() -> None:
+    global _bot_listener
+    with _bot_listener_lock:
+        if _bot_listener is not None:
+            return
+        lines: queue.SimpleQueue = queue.SimpleQueue()
+        bot_lines.addHandler(QueueHandler(lines))
+        _bot_listener = QueueListener(lines, BotFileHandler())
+        _bot_listener.start()
+        atexit.register(_bot_listener.stop)
+
+
+def bot_log(bot_id: int, log_dir: str) -> Callable[[str], None]:
+    """Return a ``log(message)`` appending to ``<log_dir>/bot_<id>.log``.
+
+    Lines are written by a background thread, so bots running on the
+    dashboard's event loop never block on file I/O, and nothing is echoed
+    to the server's console.
+    """
+    _start_bot_listener()
+    extra = {"log_path": str(Path(log_dir) / f"bot_{bot_id}.log")}
+    return lambda message: bot_lines.info(message, extra=extra)
+
+
 def init_logging(sentry_dsn: Optional[str] = None) -> None:
     """Initialize optional integrations like Sentry."""
     if sentry_dsn:
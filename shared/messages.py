@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+from pathlib import Path
+from threading import Lock
+
+from shared.config import load_config
+
+DEFAULT_MESSAGE = "Hello from KickBot"
+
+
+class MessageProvider:
+    """LRU cache of parsed message files keyed by path and mtime.
+
+    Files are only re-read when their modification time or size changes, so
+    scheduler ticks cost a single ``stat`` instead of a full read.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, int(max_entries))
+        self._files: OrderedDict[str, tuple[tuple[int, int], list[str]]] = OrderedDict()
+        self._cursors: dict[tuple[str, object], int] = {}
+        self._lock = Lock()
+
+    def lines(self, path: str | os.PathLike | None) -> list[str]:
+        if not path:
+            return []
+        resolved = Path(path).expanduser()
+        try:
+            st = resolved.stat()
+        except OSError:
+            return []
+        key = str(resolved)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._files.get(key)
+            if cached is not None and cached[0] == stamp:
+                self._files.move_to_end(key)
+                return cached[1]
+        try:
+            text = resolved.read_text(errors="ignore")
+        except OSError:
+            return []
+        parsed = [line.strip() for line in text.splitlines() if line.strip()]
+        with self._lock:
+            self._files[key] = (stamp, parsed)
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_entries:
+                evicted, _ = self._files.popitem(last=False)
+                for cursor in [c for c in self._cursors if c[0] == evicted]:
+                    del self._cursors[cursor]
+        return parsed
+
+    def first(
+        self, path: str | os.PathLike | None, default: str = DEFAULT_MESSAGE
+    ) -> str:
+        lines = self.lines(path)
+        return lines[0] if lines else default
+
+    def next(
+        self,
+        path: str | os.PathLike | None,
+        key: object,
+        default: str = DEFAULT_MESSAGE,
+    ) -> str:
+        """Return the next line for ``key``, cycling through the file."""
+        lines = self.lines(path)
+        if not lines:
+            return default
+        cursor_key = (str(Path(path).expanduser()), key)
+        with self._lock:
+            idx = self._cursors.get(cursor_key, 0) % len(lines)
+            self._cursors[cursor_key] = idx + 1
+        return lines[idx]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._cursors.clear()
+
+
+messages = MessageProvider(load_config().MESSAGE_CACHE_SIZE)
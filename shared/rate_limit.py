@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+import random
+from threading import Lock
+import time
+
+from shared.config import load_config
+
+LIMIT_KEYS = ("token_rate", "token_burst", "channel_rate", "channel_burst")
+RELOAD_SECONDS = 5.0
+
+
+def default_limits() -> dict:
+    cfg = load_config()
+    return {
+        "token_rate": cfg.SEND_RATE_PER_TOKEN,
+        "token_burst": cfg.SEND_BURST_PER_TOKEN,
+        "channel_rate": cfg.SEND_RATE_PER_CHANNEL,
+        "channel_burst": cfg.SEND_BURST_PER_CHANNEL,
+    }
+
+
+def load_limits(path: str | os.PathLike | None = None) -> dict:
+    limits = default_limits()
+    try:
+        stored = json.loads(Path(path or load_config().RATE_LIMIT_FILE).read_text())
+    except (OSError, ValueError):
+        return limits
+    if isinstance(stored, dict):
+        limits.update({key: stored[key] for key in LIMIT_KEYS if key in stored})
+    return limits
+
+
+def save_limits(limits: dict, path: str | os.PathLike | None = None) -> None:
+    target = Path(path or load_config().RATE_LIMIT_FILE)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    tmp.write_text(json.dumps({key: limits[key] for key in LIMIT_KEYS}))
+    tmp.replace(target)
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of rejecting.
+
+    Tokens may go negative: each caller takes one and waits until the debt
+    is repaid, so concurrent callers are spaced ``1 / rate`` apart.
+    """
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long to wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def block(self, now: float, seconds: float) -> None:
+        """Hand out nothing for ``seconds``, e.g. after a 429."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class SendLimiter:
+    """Per-token and per-channel send pacing shared by bots in a process.
+
+    Limits are read from ``RATE_LIMIT_FILE`` (written by the dashboard) at
+    most every ``RELOAD_SECONDS``.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None, clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.limits = default_limits()
+        self._tokens: dict[str, TokenBucket] = {}
+        self._channels: dict[str, TokenBucket] = {}
+        self._stamp: int | None = None
+        self._checked = float("-inf")
+        self._lock = Lock()
+
+    def configure(self, limits: dict) -> None:
+        with self._lock:
+            self.limits = {**self.limits, **limits}
+            for bucket in self._tokens.values():
+                bucket.rate = float(self.limits["token_rate"])
+                bucket.burst = float(self.limits["token_burst"])
+            for bucket in self._channels.values():
+                bucket.rate = float(self.limits["channel_rate"])
+                bucket.burst = float(self.limits["channel_burst"])
+
+    def refresh(self) -> None:
+        now = self.clock()
+        if now - self._checked < RELOAD_SECONDS:
+            return
+        self._checked = now
+        try:
+            stamp = Path(self.path or load_config().RATE_LIMIT_FILE).stat().st_mtime_ns
+        except OSError:
+            return
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.configure(load_limits(self.path))
+
+    def _bucket(self, buckets: dict, key: str, kind: str, now: float) -> TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = TokenBucket(
+                float(self.limits[f"{kind}_rate"]),
+                float(self.limits[f"{kind}_burst"]),
+                now,
+            )
+        return bucket
+
+    def _reserve(self, buckets: dict, key: str, kind: str) -> float:
+        self.refresh()
+        with self._lock:
+            now = self.clock()
+            return self._bucket(buckets, key, kind, now).reserve(now)
+
+    def reserve_token(self, token: str) -> float:
+        return self._reserve(self._tokens, token, "token")
+
+    def reserve_channel(self, channel: str) -> float:
+        return self._reserve(self._channels, channel, "channel")
+
+    async def acquire(self, token: str, channel: str) -> float:
+        """Wait for a send slot on ``token`` and then on ``channel``.
+
+        The channel slot is only reserved once the token may send, so a bot
+        paying off its token's debt does not hold up the channel for others.
+        Returns the total time waited.
+        """
+        waited = 0.0
+        for reserve, key in (
+            (self.reserve_token, token),
+            (self.reserve_channel, channel),
+        ):
+            delay = reserve(key)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                waited += delay
+        return waited
+
+    def penalize(self, token: str, retry_after: float) -> None:
+        """Pause ``token`` after a 429.
+
+        Queued bots are released one slot at a time afterwards, with a
+        little jitter, instead of all retrying at once.
+        """
+        with self._lock:
+            now = self.clock()
+            bucket = self._bucket(self._tokens, token, "token", now)
+            bucket.block(now, retry_after + random.uniform(0, 1 / bucket.rate))
+
+
+limiter = SendLimiter()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterable
 
 
 @dataclass(frozen=True)
@@ -30,6 +30,21 @@ class SocialPlatformAdapter(ABC):
     def follow_channel(self, account_id: str, channel: str) -> PlatformActionResult:
         raise NotImplementedError
 
+    def send_many(
+        self, items: Iterable[tuple[str, str, str]]
+    ) -> list[PlatformActionResult]:
+        return [
+            self.send_message(account_id, channel, message)
+            for account_id, channel, message in items
+        ]
+
+    def follow_many(
+        self, items: Iterable[tuple[str, str]]
+    ) -> list[PlatformActionResult]:
+        return [
+            self.follow_channel(account_id, channel) for account_id, channel in items
+        ]
+
     @abstractmethod
     def unfollow_channel(self, account_id: str, channel: str) -> PlatformActionResult:
         raise NotImplementedError
@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from bots.supervisor import BotSpec
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def wait_for():
+    def wait(predicate, timeout=5.0, interval=0.05):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(interval)
+        return False
+
+    return wait
+
+
+@pytest.fixture
+def capture_queries():
+    @contextmanager
+    def capture(engine):
+        statements = []
+
+        def before(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before)
+
+    return capture
+
+
+@pytest.fixture
+def make_spec(tmp_path):
+    def make(bot_id, **fields):
+        return BotSpec(
+            **{
+                "bot_id": bot_id,
+                "channel": "chan",
+                "message": "hello",
+                "interval": 60,
+                "token": "KP_UIDz-ssn=fake-session-value",
+                "test_mode": "local",
+                "log_dir": str(tmp_path / "logs"),
+                "store_path": str(tmp_path / f"mock_{bot_id}.json"),
+                **fields,
+            }
+        )
+
+    return make
@@ -1,6 +1,13 @@
+import json
+import os
 import pytest
 import bcrypt
+import sqlite3
+import subprocess
+import sys
 import time
+from pathlib import Path
+from sqlalchemy import create_engine
 
 from backend import create_app
 from backend.models import db
@@ -18,6 +25,7 @@ def client(tmp_path):
             "BOT_LOG_DIR": str(tmp_path / "logs"),
             "LOCAL_KICK_MOCK_FILE": str(tmp_path / "logs" / "local_kick_mock.jsonl"),
             "BOT_FORCE_LOCAL_TEST": True,
+            "RATE_LIMIT_FILE": str(tmp_path / "rate_limits.json"),
         }
     )
     with app.test_client() as client:
@@ -111,6 +119,8 @@ def test_bot_start_stop(client, tmp_path):
 
     res = client.get(f"/dashboard/api/bots/{aid}/status")
     assert res.status_code == 200
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'bot_start_seconds_count{runner="inprocess"}' in metrics
 
     res = client.post(f"/dashboard/api/bots/{aid}/stop")
     assert res.status_code == 200
@@ -230,3 +240,397 @@ def test_local_events_can_be_cleared(client):
 
     assert res.status_code == 200
     assert client.get("/dashboard/api/local/events").get_json()["items"] == []
+
+
+def test_rate_limits_can_be_tuned(client):
+    res = client.get("/dashboard/api/rate-limits")
+    assert res.status_code == 200
+    assert set(res.get_json()) == {
+        "token_rate",
+        "token_burst",
+        "channel_rate",
+        "channel_burst",
+    }
+
+    res = client.patch("/dashboard/api/rate-limits", json={"token_rate": "0.5"})
+    assert res.status_code == 200
+    assert res.get_json()["token_rate"] == 0.5
+    assert client.get("/dashboard/api/rate-limits").get_json()["token_rate"] == 0.5
+
+    res = client.patch("/dashboard/api/rate-limits", json={"channel_burst": 0})
+    assert res.status_code == 400
+
+
+def _group_listing_selects(client, capture_queries, groups):
+    for g in range(groups):
+        gid = client.post(
+            "/dashboard/api/groups", json={"name": f"n{g}", "target": "t"}
+        ).get_json()["id"]
+        for a in range(3):
+            client.post(
+                "/dashboard/api/accounts",
+                json={"username": f"n{g}-{a}", "password": "p", "group_id": gid},
+            )
+    with client.application.app_context():
+        engine = db.engine
+    with capture_queries(engine) as statements:
+        full = client.get("/dashboard/api/groups?per_page=20").get_json()
+        full_selects = len(statements)
+        counts = client.get("/dashboard/api/groups?per_page=20&counts=1").get_json()
+    return full, counts, full_selects, len(statements) - full_selects
+
+
+def test_group_listing_query_count_is_constant(client, capture_queries):
+    full, counts, full_selects, count_selects = _group_listing_selects(
+        client, capture_queries, 8
+    )
+
+    assert all(len(g["bots"]) == 3 for g in full["items"])
+    assert [g["bot_count"] for g in counts["items"]] == [3] * 8
+    assert "bots" not in counts["items"][0]
+    # one page query, one total, one for the accounts/counts of the page
+    assert full_selects == 3
+    assert count_selects == 3
+
+
+def test_accounts_keyset_pagination(client):
+    from backend.models import Account, Group
+
+    with client.application.app_context():
+        group = Group(name="keyset", target="t")
+        db.session.add(group)
+        db.session.flush()
+        db.session.add_all(
+            Account(username=f"Key{i:03d}", password="p", group_id=group.id)
+            for i in range(45)
+        )
+        db.session.commit()
+
+    seen, after = [], 0
+    while after is not None:
+        page = client.get(
+            f"/dashboard/api/accounts?after_id={after}&per_page=20"
+        ).get_json()
+        assert "total" not in page
+        seen += [a["id"] for a in page["items"]]
+        after = page["next_after_id"]
+    assert len(seen) == 45 and seen == sorted(seen)
+
+    page = client.get(
+        "/dashboard/api/bots?after_id=0&per_page=5&total=1&search=key01&match=prefix"
+    ).get_json()
+    assert [b["username"] for b in page["items"]] == [f"Key01{i}" for i in range(5)]
+    assert page["total"] == 10
+    assert page["next_after_id"] == page["items"][-1]["id"]
+
+    with client.application.app_context():
+        plan = db.session.execute(
+            db.text(
+                "EXPLAIN QUERY PLAN SELECT id FROM accounts "
+                "WHERE lower(username) >= 'key01' AND lower(username) < 'key02'"
+            )
+        ).all()
+    assert "ix_accounts_username_lower" in " ".join(str(row) for row in plan)
+
+
+def test_outdated_schema_is_refused(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE accounts (id INTEGER PRIMARY KEY, username VARCHAR(120), "
+        "password TEXT, proxy VARCHAR(200), messages_file VARCHAR(200), "
+        "group_id INTEGER)"
+    )
+    conn.close()
+
+    with pytest.raises(RuntimeError, match="accounts.token_kind"):
+        create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+
+
+def test_upgrade_migrates_a_database_made_by_create_all(tmp_path):
+    path = tmp_path / "old.db"
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    engine.dispose()
+    # the schema the server built before the migrations were added
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX ix_groups_name_lower")
+    conn.execute("DROP INDEX ix_accounts_username_lower")
+    conn.execute("ALTER TABLE accounts DROP COLUMN token_kind")
+    conn.execute("ALTER TABLE accounts DROP COLUMN token_mask")
+    conn.execute("INSERT INTO groups (id, name, target) VALUES (1, 'g', 'chan')")
+    conn.execute(
+        "INSERT INTO accounts (username, password, group_id) "
+        "VALUES ('alice', 'KP_UIDz-ssn=fake-session-value', 1)"
+    )
+    conn.commit()
+    conn.close()
+
+    root = Path(__file__).resolve().parent.parent
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic"]
+        + ["-c", "backend/migrations/alembic.ini", "upgrade", "head"],
+        cwd=root,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{path}"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT version_num FROM alembic_version").fetchall() == [
+        ("003",)
+    ]
+    kind, mask = conn.execute("SELECT token_kind, token_mask FROM accounts").fetchone()
+    conn.close()
+    assert kind is not None and mask is not None
+    create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+
+
+def test_listings_use_stored_token_kind(client, capture_queries):
+    gid = client.post(
+        "/dashboard/api/groups", json={"name": "tok", "target": "t"}
+    ).get_json()["id"]
+    client.post(
+        "/dashboard/api/accounts",
+        json={
+            "username": "cookie",
+            "password": "KP_UIDz-ssn=fake-session-value",
+            "group_id": gid,
+        },
+    )
+    client.post(
+        "/dashboard/api/accounts",
+        json={"username": "api", "password": "oauth-token-123456789", "group_id": gid},
+    )
+    with client.application.app_context():
+        engine = db.engine
+    with capture_queries(engine) as statements:
+        accounts = client.get("/dashboard/api/accounts").get_json()["items"]
+        bots = client.get("/dashboard/api/bots").get_json()["items"]
+
+    assert [a["token_kind"] for a in accounts] == ["cookie", "api"]
+    assert [a["token_mask"] for a in accounts] == ["KP_UIDz-ssn=...", "oauth-...6789"]
+    assert [b["mode"] for b in bots] == ["local_cookie_test", "live_kick"]
+    assert not [s for s in statements if "accounts.password" in s]
+
+
+def test_listings_are_cached_until_a_write(client, capture_queries):
+    gid = client.post(
+        "/dashboard/api/groups", json={"name": "cached", "target": "t"}
+    ).get_json()["id"]
+    with client.application.app_context():
+        engine = db.engine
+    with capture_queries(engine) as statements:
+        for url in ("/dashboard/api/groups?per_page=5", "/dashboard/api/bots"):
+            client.get(url)
+            queried = len(statements)
+            client.get(url)
+            assert len(statements) == queried
+
+    client.post(
+        "/dashboard/api/accounts",
+        json={"username": "fresh", "password": "p", "group_id": gid},
+    )
+    groups = client.get("/dashboard/api/groups?per_page=5").get_json()
+    assert [b["username"] for b in groups["items"][0]["bots"]] == ["fresh"]
+    bots = client.get("/dashboard/api/bots").get_json()["items"]
+    assert [(b["username"], b["status"]) for b in bots] == [("fresh", "offline")]
+
+
+def test_concurrent_cache_misses_compute_once(client):
+    import threading
+    from shared.cache import get_or_set
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 1}
+
+    def worker():
+        with client.application.app_context():
+            results.append(get_or_set("stampede", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"value": 1}] * 8
+    assert len(calls) == 1
+
+
+def test_bulk_create_groups_and_accounts(client, capture_queries):
+    res = client.post(
+        "/dashboard/api/groups/bulk",
+        json=[
+            {"name": "bulk", "target": "t"},
+            {"name": "bulk", "target": "t"},
+            {"target": "missing-name"},
+        ],
+    )
+    assert res.status_code == 201
+    body = res.get_json()
+    assert len(body["ids"]) == 1
+    assert [e["index"] for e in body["errors"]] == [1, 2]
+    gid = body["ids"][0]
+    client.get("/dashboard/api/accounts")
+
+    accounts = [
+        {"username": f"fleet{i}", "password": f"oauth-token-{i:09d}", "group_id": gid}
+        for i in range(2000)
+    ]
+    accounts[1] = {**accounts[1], "password": "KP_UIDz-ssn=fake-session-value"}
+    accounts.append({"username": "fleet0", "password": "p", "group_id": gid})
+    accounts.append({"username": "lost", "password": "p", "group_id": gid + 1})
+    with client.application.app_context():
+        engine = db.engine
+    with capture_queries(engine) as statements:
+        res = client.post("/dashboard/api/accounts/bulk", json={"items": accounts})
+    body = res.get_json()
+    assert res.status_code == 201
+    assert len(body["ids"]) == 2000
+    assert body["errors"] == [
+        {"index": 2000, "error": "account already exists"},
+        {"index": 2001, "error": "Invalid group_id"},
+    ]
+    # 2000 rows go out as two multi-row INSERT pages, not one per account
+    assert len([s for s in statements if s.startswith("INSERT INTO accounts")]) == 2
+
+    listing = client.get("/dashboard/api/accounts?per_page=2").get_json()
+    assert listing["total"] == 2000
+    assert [a["token_kind"] for a in listing["items"]] == ["api", "cookie"]
+    events = client.get("/sync/pull").get_json()["events"]
+    assert [(e["entity"], e["action"]) for e in events] == [
+        ("group", "bulk_create"),
+        ("account", "bulk_create"),
+    ]
+    assert len(events[1]["payload"]["items"]) == 2000
+
+    res = client.post("/dashboard/api/accounts/bulk", json=[{"username": "x"}])
+    assert res.status_code == 400
+    assert client.post("/dashboard/api/groups/bulk", json={}).status_code == 400
+
+
+def test_export_and_import_stream(client):
+    groups = "\n".join(
+        json.dumps({"name": f"imp{i}", "target": "t", "interval": 30}) for i in range(3)
+    )
+    res = client.post(
+        "/dashboard/api/groups/import",
+        data=groups + "\nnot json\n" + json.dumps({"name": "imp0", "target": "t"}),
+    )
+    body = res.get_json()
+    assert body["created"] == 3
+    assert [e["line"] for e in body["errors"]] == [4, 5]
+    assert body["error_count"] == 2
+
+    rows = ["username,password,proxy,messages_file,group_id"]
+    rows += [f"csv{i},oauth-token-{i:09d},,,1" for i in range(1200)]
+    rows.append("broken,,,,1")
+    res = client.post(
+        "/dashboard/api/accounts/import?format=csv", data="\n".join(rows) + "\n"
+    )
+    body = res.get_json()
+    assert body["created"] == 1200
+    assert body["errors"] == [
+        {"line": 1202, "errors": {"password": ["Missing data for required field."]}}
+    ]
+
+    res = client.get("/dashboard/api/accounts/export?format=csv")
+    assert res.mimetype == "text/csv"
+    lines = res.get_data(as_text=True).splitlines()
+    assert lines[0] == "username,password,proxy,messages_file,group"
+    assert lines[1] == "csv0,oauth-token-000000000,,,imp0"
+    assert len(lines) == 1201
+
+    res = client.get("/dashboard/api/groups/export")
+    exported = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+    assert exported[0] == {"name": "imp0", "target": "t", "interval": 30}
+    assert len(exported) == 3
+    assert client.get("/dashboard/api/groups/export?format=xml").status_code == 400
+
+
+def test_export_imports_into_another_database(client, tmp_path):
+    for name in ("first", "second"):
+        client.post(
+            "/dashboard/api/groups", json={"name": name, "target": "t", "interval": 60}
+        )
+    client.post(
+        "/dashboard/api/accounts",
+        json={"username": "acc", "password": "oauth-token-1", "group_id": 2},
+    )
+    groups = client.get("/dashboard/api/groups/export").get_data(as_text=True)
+    accounts = client.get("/dashboard/api/accounts/export").get_data(as_text=True)
+
+    other = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/other.db",
+            "CACHE_TYPE": "SimpleCache",
+        }
+    ).test_client()
+    # an existing group shifts the ids the imported groups receive
+    other.post(
+        "/dashboard/api/groups", json={"name": "local", "target": "t", "interval": 60}
+    )
+    assert (
+        other.post("/dashboard/api/groups/import", data=groups).get_json()["created"]
+        == 2
+    )
+    body = other.post(
+        "/dashboard/api/accounts/import",
+        data=accounts + json.dumps({"username": "x", "password": "p", "group": "gone"}),
+    ).get_json()
+    assert body["created"] == 1
+    assert body["errors"] == [{"line": 2, "error": "Unknown group"}]
+
+    listing = other.get("/dashboard/api/accounts").get_json()
+    assert [a["group_id"] for a in listing["items"]] == [3]
+
+
+@pytest.mark.parametrize("action", ["sendMessage", "follow"])
+def test_local_batch_rejects_malformed_items(client, action):
+    url = f"/dashboard/api/local/actions/{action}"
+    good = {"account_id": "1", "channel": "chan", "message": "hi"}
+
+    for bad in ["text", 3, None, {"account_id": "1"}]:
+        res = client.post(url, json={"items": [good, bad]})
+        assert res.status_code == 400
+        assert res.get_json()["index"] == 1
+
+    res = client.post(url, json={"items": [good]})
+    assert res.status_code == 200
+    assert res.get_json()["total"] == 1
+
+
+def test_listing_rejects_bad_paging_and_caps_per_page(client):
+    for query in (
+        "per_page=abc",
+        "per_page=0",
+        "page=x",
+        "after_id=-1",
+        "after_id=1.5",
+    ):
+        res = client.get(f"/dashboard/api/accounts?{query}")
+        assert res.status_code == 400, query
+        assert "error" in res.get_json()
+
+    from backend.models import Group
+    from backend.routes import MAX_PER_PAGE
+
+    with client.application.app_context():
+        db.session.bulk_insert_mappings(
+            Group,
+            [
+                {"name": f"cap{i}", "target": "t", "interval": 60}
+                for i in range(MAX_PER_PAGE + 5)
+            ],
+        )
+        db.session.commit()
+    res = client.get("/dashboard/api/groups?per_page=100000&counts=1")
+    assert res.status_code == 200
+    assert len(res.get_json()["items"]) == MAX_PER_PAGE
@@ -0,0 +1,73 @@
+import time
+
+import fakeredis
+from flask import Flask
+from flask_caching import Cache
+from flask_caching.backends.rediscache import RedisCache
+
+from shared.cache import INVALIDATION_CHANNEL, TieredCache, stats
+
+
+def make_cache(server, **options):
+    remote = RedisCache(host=fakeredis.FakeRedis(server=server))
+    return TieredCache(remote, **options)
+
+
+def test_local_tier_serves_repeat_reads(clock):
+    tiered = make_cache(fakeredis.FakeServer(), local_ttl=5, clock=clock)
+    tiered.remote.set("config", {"groups": []})
+    before = (stats.local_hits, stats.remote_hits)
+
+    assert tiered.get("config") == {"groups": []}
+    assert tiered.get("config") == {"groups": []}
+    assert (stats.local_hits, stats.remote_hits) == (before[0] + 1, before[1] + 1)
+
+    tiered.remote.set("config", {"groups": ["new"]})
+    clock.advance(6)
+    assert tiered.get("config") == {"groups": ["new"]}
+    assert tiered.get("missing") is None
+
+
+def test_local_tier_is_bounded():
+    tiered = make_cache(fakeredis.FakeServer(), local_size=2)
+    for key in ("a", "b", "c"):
+        tiered.set(key, key)
+
+    assert list(tiered._local) == ["b", "c"]
+    assert tiered.get("a") == "a"
+
+
+def test_writes_invalidate_other_processes(wait_for):
+    server = fakeredis.FakeServer()
+    first = make_cache(server, local_ttl=60)
+    second = make_cache(server, local_ttl=60)
+    first.listen()
+    second.listen()
+    client = first.remote._write_client
+    assert wait_for(lambda: client.pubsub_numsub(INVALIDATION_CHANNEL)[0][1] == 2)
+    try:
+        first.set("version:groups", 1)
+        assert second.get("version:groups") == 1
+        assert "version:groups" in second._local
+
+        first.inc("version:groups")
+        assert wait_for(lambda: "version:groups" not in second._local)
+        assert second.get("version:groups") == 2
+    finally:
+        first.close()
+        second.close()
+
+
+def test_cache_builds_while_redis_is_down():
+    app = Flask("down")
+    app.config.update(
+        CACHE_TYPE="shared.cache.TieredCache",
+        CACHE_REDIS_URL="redis://127.0.0.1:1/0",
+    )
+    tiered = Cache(app).cache
+    assert tiered._listener is None
+
+    tiered.listen()
+    time.sleep(0.1)
+    assert tiered._listener.is_alive()
+    tiered.close()
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from websockets.asyncio.server import serve
+
+from bots import channels as channels_module
+from bots.channels import ChannelManager, backoff_delay
+
+
+class ChatServer:
+    def __init__(self):
+        self.connections = []
+        self.received = []
+
+    async def handler(self, ws):
+        self.connections.append(ws)
+        async for frame in ws:
+            self.received.append(frame)
+            if frame == "echo":
+                await ws.send("echo-reply")
+
+
+async def start_server():
+    chat = ChatServer()
+    server = await serve(chat.handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return chat, server, f"ws://127.0.0.1:{port}/channel/{{target}}"
+
+
+async def wait_for(predicate, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+def test_bots_on_one_channel_share_a_socket():
+    async def run():
+        chat, server, uri = await start_server()
+        manager = ChannelManager(uri)
+        try:
+            conns = [manager.acquire("chan") for _ in range(5)]
+            other = manager.acquire("other")
+            assert len({id(c) for c in conns}) == 1
+
+            await asyncio.gather(*(c.send(f"hello {i}") for i, c in enumerate(conns)))
+            await other.send("hi")
+
+            assert await wait_for(lambda: len(chat.received) == 6)
+            assert len(chat.connections) == 2
+            assert manager.open_count() == 2
+        finally:
+            await manager.close_all()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_reads_are_fanned_out_and_drops_reconnect():
+    async def run():
+        chat, server, uri = await start_server()
+        manager = ChannelManager(uri, backoff_base=0.01)
+        try:
+            channel = manager.acquire("chan")
+            first, second = channel.subscribe(), channel.subscribe()
+            await channel.send("echo")
+            assert await asyncio.wait_for(first.get(), 5) == "echo-reply"
+            assert await asyncio.wait_for(second.get(), 5) == "echo-reply"
+
+            await chat.connections[0].close()
+            assert await wait_for(lambda: not channel.is_open)
+            await channel.send("again")
+
+            assert await wait_for(lambda: "again" in chat.received)
+            assert channel.connects == 2
+        finally:
+            await manager.close_all()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_slow_subscribers_are_dropped_and_release_resets():
+    async def run():
+        chat, server, uri = await start_server()
+        manager = ChannelManager(uri)
+        try:
+            channel = manager.acquire("chan")
+            slow, fast = channel.subscribe(maxsize=2), channel.subscribe()
+            for _ in range(3):
+                await channel.send("echo")
+            for _ in range(3):
+                assert await asyncio.wait_for(fast.get(), 5) == "echo-reply"
+
+            assert channel.dropped == 1
+            assert slow.get_nowait() is None
+            assert slow.empty()
+
+            manager.release("chan")
+            assert await wait_for(lambda: not channel.is_open)
+            assert await wait_for(lambda: not channels_module._tasks)
+        finally:
+            await manager.close_all()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_unreachable_channel_gives_up_after_backoff():
+    async def run():
+        manager = ChannelManager(
+            "ws://127.0.0.1:1/{target}", attempts=3, backoff_base=0.01
+        )
+        channel = manager.acquire("chan")
+        with pytest.raises(ConnectionError):
+            await channel.send("hello")
+        assert channel.connects == 0
+        assert channel.last_error
+
+    asyncio.run(run())
+
+
+def test_backoff_is_capped_and_jittered():
+    delays = [backoff_delay(attempt, 0.5, 4.0) for attempt in range(10)]
+
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
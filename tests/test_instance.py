@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from bots.instance import BotInstance
+
+
+@pytest.fixture
+def bot():
+    account = SimpleNamespace(id=1, username="u", password="p", proxy=None)
+    group = SimpleNamespace(target="login-test")
+    bot = BotInstance(account, group)
+    yield bot
+    bot.release()
+
+
+def test_slow_login_does_not_block_the_loop(bot):
+    calls = []
+
+    def slow_login():
+        calls.append(1)
+        time.sleep(0.3)
+
+    bot.login = slow_login
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        first = asyncio.create_task(bot.ensure_login(executor))
+        await asyncio.sleep(0.05)
+        assert bot.state == "logging_in"
+        second = asyncio.create_task(bot.ensure_login(executor))
+        await asyncio.sleep(0)
+        assert bot.queued == 2
+        await asyncio.gather(first, second)
+        beat.cancel()
+        return ticks
+
+    ticks = asyncio.run(run())
+    executor.shutdown()
+
+    assert ticks > 10
+    assert calls == [1]
+    assert bot.state == "ready"
+    assert bot.queued == 0
+
+
+def test_failed_login_is_retried_on_next_send(bot):
+    attempts = []
+
+    def flaky_login():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("login failed")
+
+    bot.login = flaky_login
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await bot.ensure_login()
+        assert bot.state == "error"
+        await bot.ensure_login()
+
+    asyncio.run(run())
+
+    assert len(attempts) == 2
+    assert bot.state == "ready"
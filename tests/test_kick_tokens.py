@@ -1,10 +1,21 @@
+import asyncio
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+import pytest
+
 from shared.kick_tokens import looks_like_cookie_token, mask_token, token_info
 from shared.local_kick_mock import read_events
 from scripts.bot_transports import (
     BotRateLimited,
     BotUnauthorized,
+    HttpPool,
     LiveKickBot,
     LocalCookieBot,
+    retry_after_seconds,
 )
 from scripts.run_bot import resolve_token, resolve_transport_mode
 
@@ -174,3 +185,92 @@ def test_local_cookie_transport_records_events(tmp_path):
     assert events[0]["channel"] == "chan"
     assert events[0]["actor"] == "tester"
     assert events[0]["content"] == "hello"
+
+
+class StubChatApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.requests.append((self.client_address, body))
+        time.sleep(0.02)
+        with server.lock:
+            server.active -= 1
+        if body["content"] == "slow down":
+            payload, status = b"{}", 429
+        else:
+            payload, status = b'{"data": {"message_id": "m-1"}}', 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "7")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chat_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubChatApi)
+    server.lock = threading.Lock()
+    server.active = server.peak = 0
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_port}/public/v1/chat"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_live_transport_shares_a_bounded_pool(chat_api, monkeypatch):
+    server, url = chat_api
+    monkeypatch.setenv("KICK_HTTP_MAX_IN_FLIGHT", "4")
+    bots = [LiveKickBot(f"token-{i}", api_url=url) for i in range(10)]
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(
+                    bot.send_message_async("chan", "hello")
+                    for bot in bots
+                    for _ in range(3)
+                )
+            )
+        finally:
+            await HttpPool.close()
+
+    results = asyncio.run(run())
+
+    assert [r.message_id for r in results] == ["m-1"] * 30
+    assert server.peak <= 4
+    # keep-alive: connections are reused instead of opened per request
+    assert len({addr for addr, _ in server.requests}) <= 4
+
+
+def test_async_live_transport_reports_retry_after(chat_api):
+    _, url = chat_api
+    bot = LiveKickBot("token", api_url=url)
+
+    async def run():
+        try:
+            await bot.send_message_async("chan", "slow down")
+        finally:
+            await HttpPool.close()
+
+    with pytest.raises(BotRateLimited) as exc:
+        asyncio.run(run())
+    assert exc.value.retry_after == "7"
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert retry_after_seconds("12", 5) == 12
+    assert retry_after_seconds(None, 5) == 5
+    assert retry_after_seconds("soon", 5) == 5
+    assert 25 <= retry_after_seconds(formatdate(time.time() + 30, usegmt=True), 5) <= 30
@@ -149,3 +149,32 @@ def test_session_expiry_retries_after_refresh(tmp_path):
     assert second["processed"][0]["code"] == "ok"
     assert finished_job["status"] == "success"
     assert finished_job["attempts"] == 2
+
+
+def test_send_many_and_follow_many_share_one_state_write(tmp_path):
+    clock = FakeClock()
+    adapter = make_adapter(tmp_path, clock)
+    update_settings(adapter, per_account_limit=100, global_limit=100)
+    first = adapter.create_account("bulk-1")
+    second = adapter.create_account("bulk-2")
+    saves = []
+    original_save = adapter.store.save
+    adapter.store.save = lambda state: saves.append(1) or original_save(state)
+
+    sent = adapter.send_many(
+        [
+            (first["id"], "bulk-chan", "one"),
+            (second["id"], "bulk-chan", "two"),
+            ("missing", "bulk-chan", "three"),
+        ]
+    )
+    followed = adapter.follow_many(
+        [(first["id"], "bulk-chan"), (second["id"], "bulk-chan")]
+    )
+
+    assert len(saves) == 2
+    assert [r.ok for r in sent] == [True, True, False]
+    assert sent[2].code == "not_found"
+    assert all(r.ok for r in followed)
+    assert adapter.get_channel("bulk-chan")["messages_count"] == 2
+    assert set(adapter.get_followers("bulk-chan")) == {first["id"], second["id"]}
@@ -0,0 +1,58 @@
+import os
+
+from shared.messages import DEFAULT_MESSAGE, MessageProvider
+
+
+def test_first_line_and_default(tmp_path):
+    provider = MessageProvider()
+    path = tmp_path / "msgs.txt"
+    path.write_text("\nhello\nworld\n")
+
+    assert provider.first(path) == "hello"
+    assert provider.first(tmp_path / "missing.txt") == DEFAULT_MESSAGE
+    assert provider.first(None) == DEFAULT_MESSAGE
+
+
+def test_file_is_reread_only_when_mtime_changes(tmp_path, monkeypatch):
+    provider = MessageProvider()
+    path = tmp_path / "msgs.txt"
+    path.write_text("one\n")
+    reads = []
+    original = type(path).read_text
+
+    def counting_read(self, *args, **kwargs):
+        reads.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(path), "read_text", counting_read)
+
+    for _ in range(5):
+        assert provider.first(path) == "one"
+    assert len(reads) == 1
+
+    path.write_text("two\n")
+    os.utime(path, ns=(1, 10**18))
+    assert provider.first(path) == "two"
+    assert len(reads) == 2
+
+
+def test_round_robin_per_key(tmp_path):
+    provider = MessageProvider()
+    path = tmp_path / "msgs.txt"
+    path.write_text("a\nb\nc\n")
+
+    assert [provider.next(path, 1) for _ in range(4)] == ["a", "b", "c", "a"]
+    assert provider.next(path, 2) == "a"
+
+
+def test_lru_eviction(tmp_path):
+    provider = MessageProvider(max_entries=2)
+    paths = []
+    for idx in range(3):
+        path = tmp_path / f"m{idx}.txt"
+        path.write_text(f"line {idx}\n")
+        paths.append(path)
+        provider.first(path)
+
+    assert str(paths[0]) not in provider._files
+    assert str(paths[2]) in provider._files
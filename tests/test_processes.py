@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+import pytest
+
+from bots.processes import ProcessSupervisor
+
+
+@pytest.fixture
+def processes():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    exits = []
+    sup = ProcessSupervisor(loop, on_exit=lambda *args: exits.append(args))
+    sup.exits = exits
+    yield sup
+    sup.stop_all()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def test_stop_is_reaped_and_reported(make_spec, processes, wait_for):
+    run, started = processes.start(make_spec(1))
+    assert started is True
+    assert processes.start(make_spec(1))[1] is False
+    assert processes.running_ids() == [1]
+    assert processes.status(1)["pid"] == run.proc.pid
+
+    assert processes.stop(1) is True
+    assert wait_for(lambda: processes.exits, timeout=10)
+    assert processes.exits == [(1, "stopped", None)]
+    status = processes.status(1)
+    assert status["running"] is False
+    assert status["state"] == "stopped"
+    assert status["returncode"] is not None
+    assert processes.stop(1) is False
+    assert len(processes) == 0
+
+
+def test_crash_is_reported_as_error(make_spec, processes, wait_for):
+    processes.start(make_spec(2, test_mode="bogus"))
+
+    assert wait_for(lambda: processes.exits, timeout=10)
+    assert processes.exits == [(2, "error", "exit code 2")]
+    assert processes.status(2)["state"] == "error"
+
+    run, started = processes.start(make_spec(2))
+    assert started is True
+    assert run.restarts == 1
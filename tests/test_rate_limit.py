@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from shared.rate_limit import SendLimiter, TokenBucket, load_limits
+
+
+def make_limiter(tmp_path, clock, **limits):
+    path = tmp_path / "rate_limits.json"
+    limiter = SendLimiter(path=path, clock=clock)
+    limiter.configure(limits)
+    return limiter
+
+
+def test_bucket_spaces_reservations_after_burst():
+    bucket = TokenBucket(rate=2, burst=2, now=0.0)
+
+    assert [bucket.reserve(0.0) for _ in range(5)] == [0.0, 0.0, 0.5, 1.0, 1.5]
+    assert bucket.reserve(10.0) == 0.0
+
+
+def test_channel_limit_is_shared(tmp_path, clock):
+    limiter = make_limiter(
+        tmp_path,
+        clock,
+        token_rate=10,
+        token_burst=10,
+        channel_rate=1,
+        channel_burst=1,
+    )
+
+    delays = [limiter.reserve_channel("chan") for _ in range(3)]
+
+    assert delays == [0.0, 1.0, 2.0]
+    assert limiter.reserve_channel("other") == 0.0
+
+
+def test_rate_limited_token_releases_bots_one_at_a_time(tmp_path, clock):
+    limiter = make_limiter(
+        tmp_path,
+        clock,
+        token_rate=1,
+        token_burst=5,
+        channel_rate=100,
+        channel_burst=100,
+    )
+
+    limiter.penalize("token", 30)
+    delays = [limiter.reserve_token("token") for _ in range(3)]
+
+    assert 31 <= delays[0] <= 32
+    assert [round(b - a, 6) for a, b in zip(delays, delays[1:])] == [1.0, 1.0]
+
+
+def test_limits_reload_from_dashboard_file(tmp_path, clock):
+    limiter = make_limiter(tmp_path, clock, token_rate=1, token_burst=1)
+    limiter.reserve_token("token")
+    (tmp_path / "rate_limits.json").write_text(
+        json.dumps({"token_rate": 4, "token_burst": 1})
+    )
+
+    clock.advance(10)
+    limiter.reserve_token("token")
+
+    assert limiter.limits["token_rate"] == 4
+    assert load_limits(tmp_path / "rate_limits.json")["token_rate"] == 4
+    assert asyncio.run(limiter.acquire("token", "chan")) == 0.25
+
+
+def test_token_debt_does_not_hold_a_channel_slot(tmp_path, clock):
+    limiter = make_limiter(
+        tmp_path,
+        clock,
+        token_rate=10,
+        token_burst=1,
+        channel_rate=1,
+        channel_burst=1,
+    )
+    limiter.penalize("slow", 0.1)
+
+    async def run():
+        slow = asyncio.create_task(limiter.acquire("slow", "chan"))
+        await asyncio.sleep(0)
+        fast = await limiter.acquire("fast", "chan")
+        clock.advance(1)
+        return fast, await slow
+
+    fast, slow = asyncio.run(run())
+
+    assert fast == 0.0
+    assert 0.2 <= slow <= 0.3
@@ -0,0 +1,327 @@
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from backend import create_app, scheduler
+from backend.models import Log, db
+from shared.local_kick_mock import read_events
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/test.db",
+            "CACHE_TYPE": "SimpleCache",
+            "BOT_LOG_DIR": str(tmp_path / "logs"),
+            "LOCAL_KICK_MOCK_FILE": str(tmp_path / "logs" / "local_kick_mock.json"),
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    scheduler.snapshot.clear()
+    yield app
+    scheduler._remove_bot_jobs()
+    scheduler.snapshot.clear()
+
+
+def _seed(client, groups=3, per_group=4):
+    ids = []
+    for g in range(groups):
+        gid = client.post(
+            "/dashboard/api/groups",
+            json={"name": f"g{g}", "target": f"chan{g}", "interval": 60},
+        ).get_json()["id"]
+        for a in range(per_group):
+            ids.append(
+                client.post(
+                    "/dashboard/api/accounts",
+                    json={"username": f"u{g}-{a}", "password": "p", "group_id": gid},
+                ).get_json()["id"]
+            )
+    return ids
+
+
+def test_schedule_all_uses_one_query(app, capture_queries):
+    client = app.test_client()
+    ids = _seed(client)
+    with app.app_context(), capture_queries(db.engine) as statements:
+        scheduler.schedule_all(app.extensions["socketio"])
+
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+    assert {job.id for job in scheduler.sched.get_jobs()} >= {str(i) for i in ids}
+
+
+def test_snapshot_is_invalidated_by_sync_events(app, capture_queries):
+    client = app.test_client()
+    ids = _seed(client, groups=1, per_group=2)
+    with app.app_context():
+        scheduler.snapshot.load()
+        account, group = scheduler.snapshot.get(ids[0])
+        assert group.target == "chan0"
+
+        with capture_queries(db.engine) as statements:
+            scheduler.snapshot.get(ids[0])
+        assert statements == []
+
+        scheduler.log_sync_event(
+            "group", "update", {"id": group.id}, app.extensions["socketio"]
+        )
+        assert ids[0] not in scheduler.snapshot._entries
+        assert ids[1] not in scheduler.snapshot._entries
+        assert scheduler.snapshot.get(ids[0])[0].username == account.username
+
+
+def test_group_mode_schedules_one_job_per_group(app):
+    client = app.test_client()
+    ids = _seed(client, groups=2, per_group=5)
+    app.config.update(
+        SCHEDULER_MODE="group", SCHEDULER_BATCH_SIZE=3, SCHEDULER_JITTER_SECONDS=0
+    )
+    with app.app_context():
+        scheduler.schedule_all(app.extensions["socketio"])
+    job_ids = {job.id for job in scheduler.sched.get_jobs()}
+    assert not job_ids & {str(i) for i in ids}
+    assert len([j for j in job_ids if j.startswith("group-")]) == 2
+
+    scheduler.APP = app
+    try:
+        asyncio.run(scheduler.send_group_job(ids[:5], app.extensions["socketio"]))
+    finally:
+        scheduler.APP = None
+
+    events = read_events(path=app.config["LOCAL_KICK_MOCK_FILE"])
+    sent = [e for e in events if e["action"] == "send_message"]
+    assert {e["account_id"] for e in sent} == {str(i) for i in ids[:5]}
+    scheduler.log_buffer.drain(10)
+    with app.app_context():
+        assert Log.query.count() == 5
+
+
+def test_wheel_backend_keeps_bot_ticks_off_apscheduler(app):
+    client = app.test_client()
+    ids = _seed(client, groups=1, per_group=3)
+    app.config["SCHEDULER_BACKEND"] = "wheel"
+    with app.app_context():
+        scheduler.schedule_all(app.extensions["socketio"])
+
+    assert set(scheduler.wheel.keys()) == {str(i) for i in ids}
+    assert not {job.id for job in scheduler.sched.get_jobs()} & set(
+        scheduler.wheel.keys()
+    )
+    assert scheduler.sched.get_job("sync_sender") is not None
+
+
+def test_process_bots_do_not_hold_scheduler_threads(app, wait_for):
+    client = app.test_client()
+    ids = _seed(client, groups=1, per_group=2)
+    app.config["BOT_RUNNER"] = "process"
+    scheduler.APP = app
+    try:
+        for bot_id in ids:
+            scheduler.sched.add_job(
+                scheduler.run_bot_task,
+                args=(bot_id, app.extensions["socketio"]),
+                id=f"launch-{bot_id}",
+            )
+        assert wait_for(lambda: sorted(scheduler.processes.running_ids()) == ids)
+        assert wait_for(
+            lambda: scheduler.registry.get_sample_value("scheduler_busy_threads") == 0
+        )
+    finally:
+        scheduler.APP = None
+        scheduler.processes.stop_all()
+
+
+def test_background_work_uses_scheduler_pool(app):
+    from backend.database import SCHEDULER_BIND, background_context
+
+    with app.app_context():
+        web, background = db.engine, db.engines[SCHEDULER_BIND]
+        assert db.session.get_bind() is web
+    assert web is not background
+    assert (web.pool.size(), background.pool.size()) == (10, 5)
+
+    waits = scheduler.registry.get_sample_value(
+        "db_pool_checkout_seconds_count", {"pool": SCHEDULER_BIND}
+    )
+    with background_context(app):
+        assert db.session.get_bind() is background
+        assert Log.query.count() == 0
+        assert (
+            scheduler.registry.get_sample_value(
+                "db_pool_connections", {"pool": SCHEDULER_BIND, "state": "checkedout"}
+            )
+            == 1
+        )
+    assert (
+        scheduler.registry.get_sample_value(
+            "db_pool_checkout_seconds_count", {"pool": SCHEDULER_BIND}
+        )
+        == (waits or 0) + 1
+    )
+
+
+def test_sqlite_pragmas_and_serialized_writes(app):
+    from backend.database import SCHEDULER_BIND, writes
+
+    with app.app_context():
+        for engine in (db.engine, db.engines[SCHEDULER_BIND]):
+            with engine.connect() as conn:
+                pragma = conn.exec_driver_sql
+                assert pragma("PRAGMA journal_mode").scalar() == "wal"
+                assert pragma("PRAGMA synchronous").scalar() == 1
+                assert pragma("PRAGMA busy_timeout").scalar() == 5000
+
+    def insert(message):
+        db.session.add(Log(message=message))
+        db.session.commit()
+
+    done = writes.stats.completed
+    pending = [writes.submit(app, insert, f"m{i}") for i in range(20)]
+    for future in pending:
+        future.result(timeout=10)
+    assert writes.stats.completed == done + 20
+    with app.app_context():
+        assert Log.query.count() == 20
+    assert (
+        scheduler.registry.get_sample_value("db_writes", {"result": "completed"})
+        == writes.stats.completed
+    )
+    assert (
+        scheduler.registry.get_sample_value(
+            "db_write_seconds_count", {"stage": "running"}
+        )
+        >= 20
+    )
+
+
+def test_log_buffer_batches_and_applies_backpressure(app, capture_queries):
+    from backend.database import SCHEDULER_BIND, WriteQueue
+    from backend.log_buffer import LogBuffer
+
+    writes = WriteQueue()
+    buffer = LogBuffer(writes, max_rows=50, max_delay=60, capacity=100)
+    with app.app_context():
+        engine = db.engines[SCHEDULER_BIND]
+    with capture_queries(engine) as statements:
+        for i in range(49):
+            assert buffer.add(app, [(None, f"m{i}")]).done()
+        assert buffer.pending() == 49 and statements == []
+        buffer.add(app, [(None, "m49")])
+        buffer.drain(10)
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 1
+    assert buffer.stats.rows == 50 and buffer.stats.flushes == 1
+
+    # a stalled writer: rows pile up until producers are told to wait
+    blocker = Future()
+    writes.submit(app, blocker.result)
+    for i in range(3):
+        waiter = buffer.add(app, [(None, "x")] * 50)
+    assert not waiter.done()
+    assert buffer.stats.throttled == 1
+    blocker.set_result(None)
+    waiter.result(timeout=10)
+    buffer.drain(10)
+    writes.stop(10)
+    with app.app_context():
+        assert Log.query.count() == 200
+
+
+def test_log_buffer_backpressure_survives_a_failed_flush(app):
+    from backend.log_buffer import LogBuffer
+
+    class Writes:
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, app, fn, *args):
+            future = Future()
+            self.submitted.append(future)
+            return future
+
+    writes = Writes()
+    buffer = LogBuffer(writes, max_rows=10, max_delay=60, capacity=10)
+    buffer.add(app, [(None, "x")] * 10)
+    waiter = buffer.add(app, [(None, "y")] * 10)
+    assert not waiter.done()
+    writes.submitted[0].set_exception(RuntimeError("database is locked"))
+    assert waiter.result(timeout=1) is None
+    assert buffer.stats.dropped == 10 and buffer.pending() == 10
+
+
+def test_log_buffer_flushes_after_delay(app):
+    from backend.database import WriteQueue
+    from backend.log_buffer import LogBuffer
+
+    writes = WriteQueue()
+    buffer = LogBuffer(writes, max_rows=500, max_delay=0.05)
+    buffer.add(app, [(None, "late")])
+    for _ in range(100):
+        if buffer.stats.rows:
+            break
+        time.sleep(0.02)
+    assert buffer.stats.rows == 1
+    writes.stop(10)
+
+
+def test_in_memory_database_has_no_scheduler_bind(tmp_path):
+    from backend.database import SCHEDULER_BIND, background_context
+    from backend.models import Group
+
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite://",
+            "CACHE_TYPE": "SimpleCache",
+        }
+    )
+    with app.app_context():
+        assert SCHEDULER_BIND not in db.engines
+        db.session.add(Group(name="mem", target="t"))
+        db.session.commit()
+    with background_context(app):
+        assert Group.query.count() == 1
+
+
+def test_pool_wait_excludes_connect_time(tmp_path):
+    from backend import database
+    from backend.database import TimedQueuePool
+
+    waits = []
+
+    def slow_connect():
+        time.sleep(0.2)
+        return sqlite3.connect(str(tmp_path / "slow.db"))
+
+    pool = TimedQueuePool(slow_connect, pool_size=1, max_overflow=0)
+    database.observe_checkout, previous = (
+        lambda name, seconds: waits.append(seconds),
+        database.observe_checkout,
+    )
+    try:
+        pool.connect().close()
+    finally:
+        database.observe_checkout = previous
+    assert len(waits) == 1 and waits[0] < 0.1
+
+
+def test_ticks_are_referenced_and_failures_logged(caplog):
+    started = Future()
+
+    async def tick():
+        started.set_result(len(scheduler._tasks))
+        raise RuntimeError("boom")
+
+    scheduler.aio_loop.call_soon_threadsafe(scheduler._spawn, tick)
+    assert started.result(timeout=5) == 1
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), scheduler.aio_loop).result()
+
+    assert scheduler._tasks == set()
+    assert "bot tick failed" in caplog.text
+    assert "boom" in caplog.text
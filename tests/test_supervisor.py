@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+
+from bots.supervisor import BotSupervisor
+
+
+@pytest.fixture
+def supervisor():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    sup = BotSupervisor(loop)
+    yield sup
+    sup.stop_all()
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.2), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def test_start_stop_and_restart(tmp_path, supervisor, make_spec, wait_for):
+    spec = make_spec(1)
+    log_path = tmp_path / "logs" / "bot_1.log"
+
+    run, started = supervisor.start(spec)
+    assert started is True
+    assert supervisor.start(spec)[1] is False
+    assert wait_for(
+        lambda: log_path.exists() and "stage=send_result" in log_path.read_text()
+    )
+
+    assert supervisor.stop(1) is True
+    assert wait_for(lambda: not supervisor.is_running(1))
+    assert supervisor.stop(1) is False
+
+    run = supervisor.restart(spec)
+    assert supervisor.is_running(1)
+    assert run.restarts == 1
+
+
+def test_many_bots_share_one_loop(make_spec, supervisor, wait_for):
+    for bot_id in range(1, 201):
+        supervisor.start(make_spec(bot_id))
+
+    assert len(supervisor) == 200
+    supervisor.stop_all()
+    assert wait_for(lambda: len(supervisor) == 0)
+    assert supervisor.get(5).state == "stopped"
+
+
+def test_bot_lines_are_logged_off_the_console(
+    tmp_path, supervisor, capfd, make_spec, wait_for
+):
+    log_path = tmp_path / "logs" / "bot_7.log"
+    supervisor.start(make_spec(7))
+
+    assert wait_for(lambda: log_path.exists() and "stage=ready" in log_path.read_text())
+    assert log_path.read_text().splitlines()[0].endswith("runner=inprocess")
+    assert "stage=" not in capfd.readouterr().out
@@ -60,6 +60,19 @@ def test_sync_idempotent(client):
     assert Group.query.filter_by(name="g2").count() == 1
 
 
+def test_sync_push_bulk_create(client):
+    event = {
+        "event_id": "bulk",
+        "entity": "group",
+        "action": "bulk_create",
+        "payload": {
+            "items": [{"name": "b1", "target": "t"}, {"name": "b2", "target": "t"}]
+        },
+    }
+    client.post("/sync/push", json=[event])
+    assert Group.query.filter(Group.name.in_(["b1", "b2"])).count() == 2
+
+
 def test_sync_fallback(tmp_path, monkeypatch):
     recorded = []
 
@@ -0,0 +1,88 @@
+import random
+
+from backend.timing_wheel import TimingWheel
+
+
+def make_wheel(clock, **kwargs):
+    kwargs.setdefault("tick", 0.1)
+    kwargs.setdefault("slots", 8)
+    kwargs.setdefault("levels", 3)
+    return TimingWheel(clock=clock, **kwargs)
+
+
+def run_until(wheel, clock, seconds, step=0.1):
+    for _ in range(int(round(seconds / step))):
+        clock.advance(step)
+        wheel.advance()
+
+
+def test_periodic_timer_fires_on_interval(clock):
+    wheel = make_wheel(clock)
+    fired = []
+    wheel.schedule("bot-1", 1.0, lambda: fired.append(clock.now))
+
+    run_until(wheel, clock, 3.05)
+
+    assert [round(t, 1) for t in fired] == [1.0, 2.0, 3.0]
+
+
+def test_cancel_removes_timer(clock):
+    wheel = make_wheel(clock)
+    fired = []
+    wheel.schedule("a", 0.5, lambda: fired.append("a"))
+    wheel.schedule("b", 0.5, lambda: fired.append("b"))
+
+    assert wheel.cancel("a") is True
+    assert wheel.cancel("a") is False
+    run_until(wheel, clock, 0.6)
+
+    assert fired == ["b"]
+    assert len(wheel) == 1
+
+
+def test_long_intervals_cascade_through_levels(clock):
+    wheel = make_wheel(clock)
+    fired = []
+    # 8 slots * 3 levels covers 512 ticks, so 70s also exercises overflow
+    for seconds in (0.3, 2.5, 13.7, 70.0):
+        wheel.schedule(seconds, seconds, lambda s=seconds: fired.append((s, clock.now)))
+
+    run_until(wheel, clock, 70.05)
+
+    first = {}
+    for key, when in fired:
+        first.setdefault(key, when)
+    for key, when in first.items():
+        assert abs(when - key) < 0.11
+
+
+def test_missed_ticks_are_coalesced_without_drift(clock):
+    wheel = make_wheel(clock)
+    fired = []
+    handle = wheel.schedule("bot", 1.0, lambda: fired.append(clock.now))
+
+    clock.advance(5.5)
+    wheel.advance()
+
+    assert len(fired) == 1
+    assert handle.missed == 4
+    assert handle.deadline == 6.0
+    run_until(wheel, clock, 0.5)
+    assert len(fired) == 2
+
+
+def test_matches_naive_schedule(clock):
+    rng = random.Random(7)
+    wheel = make_wheel(clock)
+    counts = {}
+    intervals = {i: rng.choice([0.2, 0.7, 1.3, 4.0, 9.9]) for i in range(200)}
+    for key, interval in intervals.items():
+        wheel.schedule(
+            key, interval, lambda k=key: counts.__setitem__(k, counts.get(k, 0) + 1)
+        )
+
+    run_until(wheel, clock, 30.0)
+
+    for key, interval in intervals.items():
+        expected = int(30.0 // interval + 1e-9)
+        assert abs(counts.get(key, 0) - expected) <= 1
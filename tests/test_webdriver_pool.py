@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from backend import create_app, scheduler
+from bots.webdriver_pool import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.alive = True
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(clock, **kwargs):
+    created = []
+
+    def factory(proxy):
+        created.append(FakeDriver(proxy))
+        return created[-1]
+
+    pool = WebDriverPool(
+        factory=factory,
+        probe=lambda driver: driver.alive,
+        clock=clock,
+        **kwargs,
+    )
+    return pool, created
+
+
+def test_drivers_are_reused_per_proxy(clock):
+    pool, created = make_pool(clock, max_size=2)
+
+    first = pool.checkout("proxy-a")
+    pool.checkin(first)
+    assert pool.checkout("proxy-a") is first
+    other = pool.checkout("proxy-b")
+
+    assert other is not first and other.proxy == "proxy-b"
+    assert len(created) == 2
+    assert (pool.stats.hits, pool.stats.misses) == (1, 2)
+
+
+def test_dead_drivers_are_replaced_on_checkout(clock):
+    pool, created = make_pool(clock)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    driver.alive = False
+
+    replacement = pool.checkout()
+
+    assert replacement is not driver
+    assert driver.quit_called
+    assert pool.stats.dead == 1
+
+
+def test_idle_drivers_are_evicted_down_to_the_warm_minimum(clock):
+    pool, created = make_pool(clock, min_size=1, idle_timeout=60)
+    assert pool.warm(count=3) == 3
+
+    clock.advance(61)
+    assert pool.evict_idle() == 2
+    assert pool.idle_count() == 1
+    assert sum(d.quit_called for d in created) == 2
+
+
+def test_drivers_are_recycled_after_max_uses(clock):
+    pool, created = make_pool(clock, max_uses=2)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    assert pool.checkout() is driver
+    pool.checkin(driver)
+
+    assert driver.quit_called
+    assert pool.checkout() is not driver
+    assert pool.stats.recycled == 1
+
+
+def test_checkout_never_waits_and_only_idle_drivers_are_capped(clock):
+    pool, created = make_pool(clock, max_size=1)
+    drivers = [pool.checkout() for _ in range(3)]
+    assert len(created) == 3 and pool.leased_count() == 3
+
+    for driver in drivers:
+        pool.checkin(driver)
+    assert pool.idle_count() == 1
+    assert [d.quit_called for d in drivers] == [False, True, True]
+
+
+def test_scheduler_evicts_idle_drivers_without_pool_traffic(
+    clock, monkeypatch, tmp_path, wait_for
+):
+    pool = scheduler.driver_pool
+    created = []
+
+    def factory(proxy):
+        created.append(FakeDriver(proxy))
+        return created[-1]
+
+    monkeypatch.setattr(pool, "factory", factory)
+    monkeypatch.setattr(pool, "clock", clock)
+    monkeypatch.setattr(pool, "min_size", 0)
+    monkeypatch.setattr(pool, "idle_timeout", 60)
+    create_app(
+        {"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/t.db"}
+    )
+    pool.warm(count=2)
+    clock.advance(61)
+
+    scheduler.sched.get_job("webdriver_evict").modify(next_run_time=datetime.now())
+    assert wait_for(lambda: all(d.quit_called for d in created))
+    assert pool.idle_count() == 0
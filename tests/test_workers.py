@@ -0,0 +1,124 @@
+import os
+import signal
+import time
+
+import pytest
+
+from bots.workers import WORKER_SCRIPT, ZYGOTE_SCRIPT, WorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(size=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_consistent_hash_spreads_and_is_stable():
+    pool = WorkerPool(size=4)
+    owners = [pool.worker_for(bot_id).index for bot_id in range(1000)]
+
+    assert set(owners) == {0, 1, 2, 3}
+    assert min(owners.count(i) for i in range(4)) > 150
+    assert owners == [pool.worker_for(bot_id).index for bot_id in range(1000)]
+
+    grown = WorkerPool(size=5)
+    moved = sum(
+        1
+        for bot_id, owner in enumerate(owners)
+        if grown.worker_for(bot_id).index != owner
+    )
+    assert moved < 400
+
+
+def test_workers_host_many_bots(make_spec, pool, monkeypatch, wait_for):
+    for bot_id in range(1, 21):
+        status, started = pool.start(make_spec(bot_id))
+        assert started is True
+        assert status["running"] is True
+
+    assert pool.start(make_spec(1))[1] is False
+    pids = {pool.status(bot_id)["pid"] for bot_id in range(1, 21)}
+    assert pids == {h.pid for h in pool.handles.values()}
+    assert sorted(pool.running_ids()) == list(range(1, 21))
+    assert len(pool) == 20
+
+    assert pool.stop(3) is True
+    for _ in range(50):
+        if not pool.is_running(3):
+            break
+        time.sleep(0.05)
+    assert pool.is_running(3) is False
+    assert pool.stop(3) is False
+    assert wait_for(lambda: len(pool) == 19)
+
+    # the running count is tracked locally, not asked of the workers
+    for handle in pool.handles.values():
+        monkeypatch.setattr(handle, "request", None)
+    assert len(pool) == 19
+
+
+def test_zygote_forks_bots(make_spec):
+    pool = WorkerPool(size=1, script=ZYGOTE_SCRIPT)
+    pool.warm()
+    zygote = pool.handles[0].pid
+    try:
+        status, started = pool.start(make_spec(1))
+        assert started is True
+        assert status["running"] is True
+        assert status["pid"] not in {None, zygote}
+        assert pool.start(make_spec(1))[1] is False
+        assert pool.running_ids() == [1]
+
+        assert pool.stop(1) is True
+        for _ in range(50):
+            if not pool.is_running(1):
+                break
+            time.sleep(0.05)
+        status = pool.status(1)
+        assert status["running"] is False
+        assert status["returncode"] is not None
+    finally:
+        pool.shutdown()
+
+
+def test_wedged_worker_is_replaced_and_its_bots_reported(make_spec):
+    exits = []
+    pool = WorkerPool(size=1, on_exit=lambda *args: exits.append(args))
+    try:
+        pool.start(make_spec(1))
+        handle = pool.handles[0]
+        wedged = handle.pid
+        os.kill(wedged, signal.SIGSTOP)
+        handle.timeout = 0.2
+
+        assert pool.running_ids() == []
+        assert exits == [(1, "error", "worker 0 exited")]
+        assert handle.proc is None
+
+        handle.timeout = 10.0
+        status, started = pool.start(make_spec(2))
+        assert started is True
+        assert handle.pid != wedged
+        assert pool.running_ids() == [2]
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.parametrize("script", [WORKER_SCRIPT, ZYGOTE_SCRIPT])
+def test_crashed_bots_are_reported(make_spec, script, wait_for):
+    exits = []
+    pool = WorkerPool(size=1, script=script, on_exit=lambda *args: exits.append(args))
+    try:
+        # a non-numeric interval makes the send loop raise
+        pool.start(make_spec(1, interval="soon"))
+        pool.start(make_spec(2))
+        assert pool.stop(2) is True
+        assert wait_for(lambda: len(exits) == 2)
+
+        assert sorted(exits)[0][:2] == (1, "error")
+        assert sorted(exits)[1] == (2, "stopped", None)
+        assert pool.running_ids() == []
+        assert pool.handles[0].hosted == set()
+    finally:
+        pool.shutdown()